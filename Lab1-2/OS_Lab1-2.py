@@ -1,44 +1,281 @@
+import heapq
+import itertools
+import random
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
 
 
 class Process:
     """Represents a single process."""
 
-    def __init__(self, process_id: str, arrival_time: float, burst_time: float):
+    __slots__ = ('process_id', 'arrival_time', 'burst_time', 'priority',
+                 'remaining_time', 'response_time', 'turnaround_time', 'waiting_time')
+
+    def __init__(self, process_id: str, arrival_time: float, burst_time: float, priority: int = 0):
         self.process_id = process_id
         self.arrival_time = arrival_time
         self.burst_time = burst_time
+        self.priority = priority  # Lower value means higher priority
+        self.reset()
+
+    def reset(self):
+        self.remaining_time = self.burst_time
+        self.response_time = None
         self.turnaround_time = 0
         self.waiting_time = 0
 
     def update_times(self, start_time: float):
         self.waiting_time = max(0, start_time - self.arrival_time)
         self.turnaround_time = self.waiting_time + self.burst_time
+        self.response_time = self.waiting_time
+        self.remaining_time = 0
+
+    def start(self, time: float):
+        """Records the response time the first time the process gets the CPU."""
+        if self.response_time is None:
+            self.response_time = time - self.arrival_time
+
+    def finish(self, completion_time: float):
+        self.remaining_time = 0
+        self.turnaround_time = completion_time - self.arrival_time
+        self.waiting_time = self.turnaround_time - self.burst_time
+
+
+class ProcessView:
+    """Read-only view of one row of a ProcessTable, shaped like a Process."""
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: 'ProcessTable', row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def process_id(self):
+        table = self.table
+        if table.labels is not None:
+            return table.labels[self.row]
+        return table.ids[self.row] if table.ids is not None else self.row
+
+    @property
+    def arrival_time(self):
+        return self.table.arrival[self.row]
+
+    @property
+    def burst_time(self):
+        return self.table.burst[self.row]
+
+    @property
+    def remaining_time(self):
+        return self.table.remaining[self.row]
+
+    @property
+    def waiting_time(self):
+        return self.table.waiting[self.row]
+
+    @property
+    def turnaround_time(self):
+        return self.table.turnaround[self.row]
+
+    @property
+    def response_time(self):
+        # FCFS and SJF are non-preemptive, so a process responds when it starts.
+        return self.table.waiting[self.row]
+
+
+class ProcessTable:
+    """Struct-of-arrays process table backed by typed arrays.
+
+    Each column holds one machine value per process instead of one Python
+    object per field, which keeps large workloads compact and cache friendly.
+    Use typecode 'q' for integer times and 'd' for fractional ones.
+    """
+
+    def __init__(self, arrival_times: Iterable[float], burst_times: Iterable[float],
+                 process_ids: Iterable[int] = None, typecode: str = 'd'):
+        self.arrival = array(typecode, arrival_times)
+        self.burst = array(typecode, burst_times)
+        if len(self.arrival) != len(self.burst):
+            raise ValueError("Arrival and burst times must have the same length.")
+        # Without explicit ids the row number is the process id, so no column is stored.
+        self.ids = None if process_ids is None else array('q', process_ids)
+        self.remaining = array(typecode, self.burst)
+        zeros = bytes(len(self.arrival) * self.arrival.itemsize)
+        self.waiting = array(typecode, zeros)
+        self.turnaround = array(typecode, zeros)
+        self.labels = None
+
+    @classmethod
+    def from_processes(cls, processes: list[Process]) -> 'ProcessTable':
+        """Builds a table from Process objects, keeping non-integer ids as labels."""
+        integral = all(isinstance(p.arrival_time, int) and isinstance(p.burst_time, int)
+                       for p in processes)
+        table = cls([p.arrival_time for p in processes], [p.burst_time for p in processes],
+                    typecode='q' if integral else 'd')
+        if not all(isinstance(p.process_id, int) for p in processes):
+            table.labels = [p.process_id for p in processes]
+        else:
+            table.ids = array('q', (p.process_id for p in processes))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def __getitem__(self, row: int) -> ProcessView:
+        if not -len(self) <= row < len(self):
+            raise IndexError("Process table index out of range.")
+        return ProcessView(self, row % len(self))
+
+    def __iter__(self) -> Iterator[ProcessView]:
+        return (ProcessView(self, row) for row in range(len(self)))
+
+    def rows(self, order: array) -> 'ProcessTableRows':
+        return ProcessTableRows(self, order)
+
+
+class ProcessTableRows:
+    """Sequence of ProcessView objects for the given table rows, in order."""
+
+    __slots__ = ('table', 'order')
+
+    def __init__(self, table: ProcessTable, order: array):
+        self.table = table
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index: int) -> ProcessView:
+        return ProcessView(self.table, self.order[index])
+
+    def __iter__(self) -> Iterator[ProcessView]:
+        table = self.table
+        return (ProcessView(table, row) for row in self.order)
+
+
+def _in_arrival_order(arrivals: Iterable[Process]) -> Iterator[Process]:
+    """Passes arrivals through, rejecting any that go back in time."""
+    last_arrival = None
+    for process in arrivals:
+        if last_arrival is not None and process.arrival_time < last_arrival:
+            raise ValueError(f"Process '{process.process_id}' arrives out of order.")
+        last_arrival = process.arrival_time
+        yield process
 
 
 class Scheduler(ABC):
     """Abstract base class for scheduling algorithms."""
 
+    # Set to a timeline.Timeline to record what ran when; off by default.
+    timeline = None
+
     def __init__(self, process_list: list[Process]):
         self.process_list = process_list
         self.current_time = 0
         self.completed_processes = []
+        self.context_switches = 0
+        self.last_process = None
 
     @abstractmethod
     def execute(self):
         pass
 
+    # Ready-queue protocol used by the event-driven engines, PreemptiveScheduler
+    # and the multi-core simulator in smp.py.
+
+    @abstractmethod
+    def add_ready(self, process: Process):
+        pass
+
+    @abstractmethod
+    def pop_ready(self) -> Process:
+        pass
+
+    @abstractmethod
+    def has_ready(self) -> bool:
+        pass
+
+    def requeue(self, process: Process, expired: bool):
+        """Puts a process that lost the CPU back into the ready queue."""
+        self.add_ready(process)
+
+    def should_preempt(self, running: Process) -> bool:
+        return False
+
+    def preemption_rank(self, running: Process):
+        """How readily a running process gives up its core, highest first.
+
+        Used to pick which of several running processes an arrival preempts.
+        The rank must not grow while the process runs.
+        """
+        return 0
+
+    def time_slice(self, process: Process) -> float:
+        return float('inf')
+
+    def next_timer(self) -> float:
+        """Time of the next policy timer, such as a priority boost."""
+        return float('inf')
+
+    def on_event(self, running: Process):
+        """Called at every event once arrivals up to the current time are queued."""
+
+    def release(self, process: Process):
+        """Called when a process leaves this scheduler on completion."""
+
+    def migrate_out(self, process: Process):
+        """Releases a process taken with pop_ready to another scheduler, returning the policy state it carries."""
+        self.release(process)
+        return None
+
+    def migrate_in(self, process: Process, state):
+        """Queues a process migrating from another scheduler with the state migrate_out returned."""
+        self.add_ready(process)
+
+    @abstractmethod
+    def stream(self, arrivals: Iterable[Process]) -> Iterator[Process]:
+        """Yields processes as they finish, reading arrivals lazily.
+
+        Arrivals must be sorted by arrival time. Only the ready set is kept in
+        memory and nothing is added to completed_processes.
+        """
+
     def update(self, process: Process):
+        self.run(process)
+        self.completed_processes.append(process)
+
+    def run(self, process: Process):
+        """Runs a process to completion from the current time."""
+        if self.last_process is not None:
+            self.context_switches += 1
+        self.last_process = process
         process.update_times(self.current_time)
+        if self.timeline is not None:
+            self.timeline.record(0, process.process_id, self.current_time, self.current_time + process.burst_time)
         self.current_time += process.burst_time
-        self.completed_processes.append(process)
+
+    def finish_rows(self, table: ProcessTable, order: array):
+        """Records a table run whose completion order and clock are already known."""
+        if len(order):
+            self.context_switches += len(order) - (self.last_process is None)
+            self.last_process = order[-1]
+        if self.timeline is not None:
+            for row in order:
+                start = table.arrival[row] + table.waiting[row]
+                self.timeline.record(0, table[row].process_id, start, start + table.burst[row])
+        remaining = table.remaining
+        table.remaining = array(remaining.typecode, bytes(len(remaining) * remaining.itemsize))
+        self.completed_processes = table.rows(order)
 
     def show(self):
         """Prints the process list information."""
-        print("{:>12}{:>15}{:>13}{:>18}{:>15}".format("Process ID",
-                                                      "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time"))
+        print("{:>12}{:>15}{:>13}{:>18}{:>15}{:>16}".format("Process ID",
+                                                            "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time", "Response Time"))
         for process in self.completed_processes:
-            print(f"{process.process_id:>12}{process.arrival_time:>15}{process.burst_time:>13}{process.turnaround_time:>18}{process.waiting_time:>15}")
+            print(f"{process.process_id:>12}{process.arrival_time:>15}{process.burst_time:>13}{process.turnaround_time:>18}{process.waiting_time:>15}{process.response_time:>16}")
+        print(f"Context switches: {self.context_switches}")
 
 
 class FCFS(Scheduler):
@@ -46,32 +283,392 @@ class FCFS(Scheduler):
 
     def __init__(self, process_list: list[Process]):
         super().__init__(process_list)
+        self.ready_queue = deque()
+
+    def add_ready(self, process: Process):
+        self.ready_queue.append(process)
+
+    def pop_ready(self) -> Process:
+        return self.ready_queue.popleft()
+
+    def has_ready(self) -> bool:
+        return bool(self.ready_queue)
 
     def execute(self):
+        if isinstance(self.process_list, ProcessTable):
+            self._execute_table(self.process_list)
+            return
         self.process_list.sort(key=lambda process: process.arrival_time)
-        for process in self.process_list:
+        self.completed_processes.extend(self.stream(self.process_list))
+
+    def stream(self, arrivals: Iterable[Process]) -> Iterator[Process]:
+        for process in _in_arrival_order(arrivals):
             if self.current_time < process.arrival_time:
                 self.current_time = process.arrival_time
-            self.update(process)
+            self.run(process)
+            yield process
+
+    def _execute_table(self, table: ProcessTable):
+        arrival, burst = table.arrival, table.burst
+        waiting, turnaround = table.waiting, table.turnaround
+        order = array('q', sorted(range(len(table)), key=arrival.__getitem__))
+        current_time = self.current_time
+        for row in order:
+            arrival_time = arrival[row]
+            if current_time < arrival_time:
+                current_time = arrival_time
+            waiting[row] = wait = current_time - arrival_time
+            turnaround[row] = wait + burst[row]
+            current_time += burst[row]
+        self.current_time = current_time
+        self.finish_rows(table, order)
 
 
 class SJF(Scheduler):
-    """Shortest Job First (SJF) scheduling algorithm."""
+    """Shortest Job First (SJF) scheduling algorithm.
+
+    Burst time ties go to the process that comes first in the list, or in
+    the stream, as with min() over the ready processes.
+    """
 
     def __init__(self, process_list: list[Process]):
         super().__init__(process_list)
+        self.ready_queue = []
+        self.counter = itertools.count()
+
+    def add_ready(self, process: Process):
+        heapq.heappush(self.ready_queue, (process.burst_time, next(self.counter), process))
+
+    def pop_ready(self) -> Process:
+        return heapq.heappop(self.ready_queue)[2]
+
+    def has_ready(self) -> bool:
+        return bool(self.ready_queue)
 
     def execute(self):
-        remaining_processes = self.process_list[:]
-        while remaining_processes:
-            available_processes = [
-                p for p in remaining_processes if p.arrival_time <= self.current_time]
-            if not available_processes:
-                self.current_time += 1
+        if isinstance(self.process_list, ProcessTable):
+            self._execute_table(self.process_list)
+            return
+        # The list index breaks burst time ties the same way min() does.
+        arrivals = sorted(range(len(self.process_list)),
+                          key=lambda i: self.process_list[i].arrival_time)
+        self.completed_processes.extend(
+            self._schedule((i, self.process_list[i]) for i in arrivals))
+
+    def stream(self, arrivals: Iterable[Process]) -> Iterator[Process]:
+        return self._schedule(enumerate(_in_arrival_order(arrivals)))
+
+    def _schedule(self, arrivals: Iterator[tuple[int, Process]]) -> Iterator[Process]:
+        # Walk arrivals in order and keep the ready set in a heap keyed on
+        # (burst time, tie-breaker).
+        upcoming = next(arrivals, None)
+        ready = []
+        while upcoming is not None or ready:
+            while upcoming is not None and upcoming[1].arrival_time <= self.current_time:
+                index, process = upcoming
+                heapq.heappush(ready, (process.burst_time, index, process))
+                upcoming = next(arrivals, None)
+            if not ready:
+                # CPU is idle, jump straight to the next arrival.
+                self.current_time = upcoming[1].arrival_time
                 continue
-            next_process = min(available_processes, key=lambda x: x.burst_time)
-            self.update(next_process)
-            remaining_processes.remove(next_process)
+            _, _, process = heapq.heappop(ready)
+            self.run(process)
+            yield process
+
+    def _execute_table(self, table: ProcessTable):
+        # Same walk as _schedule, over row numbers and with the clock in a local.
+        # Integer bursts are packed with the row into one int heap key, which
+        # is much cheaper to compare than a tuple.
+        arrival, burst = table.arrival, table.burst
+        waiting, turnaround = table.waiting, table.turnaround
+        n = len(table)
+        packed = burst.typecode not in 'fd'
+        arrivals = sorted(range(n), key=arrival.__getitem__)
+        order = array('q')
+        ready = []
+        current_time = self.current_time
+        next_arrival = 0
+        while next_arrival < n or ready:
+            while next_arrival < n and arrival[arrivals[next_arrival]] <= current_time:
+                row = arrivals[next_arrival]
+                heapq.heappush(ready, burst[row] * n + row if packed else (burst[row], row))
+                next_arrival += 1
+            if not ready:
+                current_time = arrival[arrivals[next_arrival]]
+                continue
+            entry = heapq.heappop(ready)
+            row = entry % n if packed else entry[1]
+            burst_time = burst[row]
+            waiting[row] = wait = current_time - arrival[row]
+            turnaround[row] = wait + burst_time
+            current_time += burst_time
+            order.append(row)
+        self.current_time = current_time
+        self.finish_rows(table, order)
+
+
+class PreemptiveScheduler(Scheduler):
+    """Discrete-event core shared by the preemptive scheduling algorithms.
+
+    The clock only moves to the next arrival, completion, time-slice expiry or
+    policy timer, so the cost grows with the number of events and not with simulated time.
+    Subclasses own the ready queue and decide when the running process yields.
+    """
+
+    def dispatch(self) -> Process:
+        process = self.pop_ready()
+        if self.last_process is not None and process is not self.last_process:
+            self.context_switches += 1
+        self.last_process = process
+        process.start(self.current_time)
+        return process
+
+    def execute(self):
+        if isinstance(self.process_list, ProcessTable):
+            raise TypeError(f"{type(self).__name__} needs Process objects, not a ProcessTable.")
+        arrivals = sorted(self.process_list, key=lambda process: process.arrival_time)
+        self.completed_processes.extend(self.stream(arrivals))
+
+    def stream(self, arrivals: Iterable[Process]) -> Iterator[Process]:
+        arrivals = _in_arrival_order(arrivals)
+        upcoming = next(arrivals, None)
+        running = None
+        finish_time = slice_end = 0
+        timeline = self.timeline
+        while True:
+            while upcoming is not None and upcoming.arrival_time <= self.current_time:
+                upcoming.reset()
+                self.add_ready(upcoming)
+                upcoming = next(arrivals, None)
+            self.on_event(running)
+
+            if running is not None:
+                if self.current_time >= finish_time:
+                    running.finish(self.current_time)
+                    self.release(running)
+                    finished, running = running, None
+                    yield finished
+                elif self.current_time >= slice_end:
+                    self.requeue(running, expired=True)
+                    running = None
+                elif self.should_preempt(running):
+                    self.requeue(running, expired=False)
+                    running = None
+
+            if running is None:
+                if not self.has_ready():
+                    if upcoming is None:
+                        break
+                    # CPU is idle, jump straight to the next arrival.
+                    self.current_time = upcoming.arrival_time
+                    continue
+                running = self.dispatch()
+                finish_time = self.current_time + running.remaining_time
+                slice_end = min(finish_time, self.current_time + self.time_slice(running))
+
+            event_time = min(slice_end, self.next_timer())
+            if upcoming is not None:
+                event_time = min(event_time, upcoming.arrival_time)
+            running.remaining_time = finish_time - event_time
+            if timeline is not None:
+                timeline.record(0, running.process_id, self.current_time, event_time)
+            self.current_time = event_time
+
+
+class SRTF(PreemptiveScheduler):
+    """Shortest Remaining Time First (SRTF) scheduling algorithm."""
+
+    def __init__(self, process_list: list[Process]):
+        super().__init__(process_list)
+        self.ready_queue = []
+        self.counter = itertools.count()
+
+    def add_ready(self, process: Process):
+        heapq.heappush(self.ready_queue, (process.remaining_time, next(self.counter), process))
+
+    def pop_ready(self) -> Process:
+        return heapq.heappop(self.ready_queue)[2]
+
+    def has_ready(self) -> bool:
+        return bool(self.ready_queue)
+
+    def should_preempt(self, running: Process) -> bool:
+        return bool(self.ready_queue) and self.ready_queue[0][0] < running.remaining_time
+
+    def preemption_rank(self, running: Process):
+        # The finish time stays put while the process runs, unlike its remaining time.
+        return self.current_time + running.remaining_time
+
+
+class RoundRobin(PreemptiveScheduler):
+    """Round Robin (RR) scheduling algorithm with a fixed time quantum."""
+
+    def __init__(self, process_list: list[Process], quantum: float = 2):
+        super().__init__(process_list)
+        if quantum <= 0:
+            raise ValueError("Quantum must be positive.")
+        self.quantum = quantum
+        self.ready_queue = deque()
+
+    def add_ready(self, process: Process):
+        self.ready_queue.append(process)
+
+    def pop_ready(self) -> Process:
+        return self.ready_queue.popleft()
+
+    def has_ready(self) -> bool:
+        return bool(self.ready_queue)
+
+    def time_slice(self, process: Process) -> float:
+        return self.quantum
+
+
+class PreemptivePriority(PreemptiveScheduler):
+    """Preemptive priority scheduling algorithm, lower value runs first."""
+
+    def __init__(self, process_list: list[Process]):
+        super().__init__(process_list)
+        self.ready_queue = []
+        self.counter = itertools.count()
+
+    def add_ready(self, process: Process):
+        heapq.heappush(self.ready_queue, (process.priority, next(self.counter), process))
+
+    def pop_ready(self) -> Process:
+        return heapq.heappop(self.ready_queue)[2]
+
+    def has_ready(self) -> bool:
+        return bool(self.ready_queue)
+
+    def should_preempt(self, running: Process) -> bool:
+        return bool(self.ready_queue) and self.ready_queue[0][0] < running.priority
+
+    def preemption_rank(self, running: Process):
+        return running.priority
+
+
+class MLFQ(PreemptiveScheduler):
+    """Multi-Level Feedback Queue (MLFQ) scheduling algorithm.
+
+    Level 0 has the highest priority. New processes enter level 0 and drop a
+    level each time they use up a full quantum. A process on a lower level is
+    preempted as soon as a higher level has work. Every `boost_interval` time
+    units all processes are moved back to level 0 so long jobs do not starve.
+    The highest non-empty level comes from a bitmap of non-empty queues, so
+    picking the next process is O(1) whatever the number of levels.
+    """
+
+    def __init__(self, process_list: list[Process], levels: int = 3,
+                 quanta: list[float] = None, boost_interval: float = None):
+        super().__init__(process_list)
+        self.quanta = list(quanta) if quanta is not None else [2 ** (level + 1) for level in range(levels)]
+        if not self.quanta or any(quantum <= 0 for quantum in self.quanta):
+            raise ValueError("Every level needs a positive quantum.")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("Boost interval must be positive.")
+        self.queues = [deque() for _ in self.quanta]
+        self.non_empty = 0  # Bit i is set while queues[i] has processes
+        self.running_levels = {}
+        self.boost_interval = boost_interval
+        self.next_boost = boost_interval if boost_interval is not None else float('inf')
+
+    def push(self, process: Process, level: int):
+        self.queues[level].append(process)
+        self.non_empty |= 1 << level
+
+    def top_level(self) -> int:
+        return (self.non_empty & -self.non_empty).bit_length() - 1
+
+    def add_ready(self, process: Process):
+        self.push(process, 0)
+
+    def pop_ready(self) -> Process:
+        level = self.top_level()
+        queue = self.queues[level]
+        process = queue.popleft()
+        if not queue:
+            self.non_empty &= ~(1 << level)
+        self.running_levels[process] = level
+        return process
+
+    def has_ready(self) -> bool:
+        return self.non_empty != 0
+
+    def requeue(self, process: Process, expired: bool):
+        level = self.running_levels.pop(process)
+        if expired:
+            level = min(level + 1, len(self.queues) - 1)
+        self.push(process, level)
+
+    def should_preempt(self, running: Process) -> bool:
+        # Any non-empty level above the running one has a lower bit set.
+        return self.non_empty & ((1 << self.running_levels[running]) - 1) != 0
+
+    def preemption_rank(self, running: Process):
+        return self.running_levels[running]
+
+    def time_slice(self, process: Process) -> float:
+        return self.quanta[self.running_levels[process]]
+
+    def next_timer(self) -> float:
+        return self.next_boost
+
+    def on_event(self, running: Process):
+        if self.current_time < self.next_boost:
+            return
+        intervals = (self.current_time - self.next_boost) // self.boost_interval + 1
+        self.next_boost += intervals * self.boost_interval
+        top = self.queues[0]
+        for queue in self.queues[1:]:
+            top.extend(queue)
+            queue.clear()
+        self.non_empty = 1 if top else 0
+        for process in self.running_levels:
+            self.running_levels[process] = 0
+
+    def release(self, process: Process):
+        del self.running_levels[process]
+
+    def migrate_out(self, process: Process):
+        return self.running_levels.pop(process)
+
+    def migrate_in(self, process: Process, state):
+        self.push(process, state)
+
+
+def _min_scan_order(processes: list[Process]) -> list:
+    """Process ids in the order the original SJF loop ran them, a min() over the ready ones."""
+    remaining = processes[:]
+    current_time = 0
+    order = []
+    while remaining:
+        available = [p for p in remaining if p.arrival_time <= current_time]
+        if not available:
+            current_time += 1
+            continue
+        process = min(available, key=lambda p: p.burst_time)
+        order.append(process.process_id)
+        current_time += process.burst_time
+        remaining.remove(process)
+    return order
+
+
+def check_sjf_ties(trials: int = 200, seed: int = 0):
+    """Checks that both SJF paths break burst ties in list order, like the original min() scan."""
+    rng = random.Random(seed)
+    workloads = [[Process("P3", 1, 2), Process("P10", 1, 2), Process("P9", 1, 2),
+                  Process("P1", 0, 3), Process("P4", 0, 2), Process("P2", 2, 2)]]
+    for _ in range(trials):
+        workloads.append([Process(f"P{i}", rng.randint(0, 10), rng.randint(1, 3))
+                          for i in rng.sample(range(50), rng.randint(1, 20))])
+    for processes in workloads:
+        expected = _min_scan_order(processes)
+        for sjf in (SJF(processes[:]), SJF(ProcessTable.from_processes(processes))):
+            sjf.execute()
+            order = [p.process_id for p in sjf.completed_processes]
+            if order != expected:
+                raise AssertionError(f"SJF ran {order}, the min() scan ran {expected}.")
 
 
 def main():
@@ -92,6 +689,48 @@ def main():
     sjf.execute()
     sjf.show()
 
+    process_list = [
+        Process("P1", 0, 8, 3),
+        Process("P2", 1, 4, 1),
+        Process("P3", 2, 9, 4),
+        Process("P4", 3, 5, 2),
+    ]
+
+    print("\nSJF Scheduling (process table):")
+    table_sjf = SJF(ProcessTable.from_processes(process_list))
+    table_sjf.execute()
+    table_sjf.show()
+
+    check_sjf_ties()
+    print("\nSJF burst ties match the original min() scan on both paths.")
+
+    # Equal bursts go to whichever process came first in the stream.
+    tied = [Process("P3", 1, 2), Process("P2", 1, 2), Process("P1", 0, 3), Process("P4", 0, 2)]
+    print("\nSJF Scheduling (streamed, tied bursts):")
+    streamed_sjf = SJF([])
+    streamed_sjf.completed_processes.extend(streamed_sjf.stream(sorted(tied, key=lambda p: p.arrival_time)))
+    streamed_sjf.show()
+
+    print("\nSRTF Scheduling:")
+    srtf = SRTF(process_list[:])
+    srtf.execute()
+    srtf.show()
+
+    print("\nRound Robin Scheduling (quantum = 2):")
+    rr = RoundRobin(process_list[:], quantum=2)
+    rr.execute()
+    rr.show()
+
+    print("\nPreemptive Priority Scheduling:")
+    priority = PreemptivePriority(process_list[:])
+    priority.execute()
+    priority.show()
+
+    print("\nMLFQ Scheduling (quanta = 2, 4, 8, boost every 20):")
+    mlfq = MLFQ(process_list[:], quanta=[2, 4, 8], boost_interval=20)
+    mlfq.execute()
+    mlfq.show()
+
 
 if __name__ == "__main__":
     main()
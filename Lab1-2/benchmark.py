@@ -0,0 +1,152 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import workload
+from table_formatter import TableFormatter
+
+scheduling = workload.scheduling
+
+try:
+    import batch_metrics
+except ImportError:  # NumPy is optional, its benchmarks are skipped without it
+    batch_metrics = None
+
+
+def _prepare_list(w: workload.Workload):
+    return w.processes()
+
+
+def _prepare_table(w: workload.Workload):
+    return scheduling.ProcessTable(w.arrival, w.burst)
+
+
+def _execute(policy: type[scheduling.Scheduler], **options) -> Callable:
+    def run(processes):
+        # execute() sorts its list in place, so every run gets its own copy.
+        policy(list(processes) if isinstance(processes, list) else processes, **options).execute()
+    return run
+
+
+def _batch(metrics: Callable) -> Callable:
+    return lambda w: metrics(w.arrival, w.burst)
+
+
+# name: (prepare the input outside the timer, timed function)
+BENCHMARKS = {
+    "fcfs": (_prepare_list, _execute(scheduling.FCFS)),
+    "sjf": (_prepare_list, _execute(scheduling.SJF)),
+    "fcfs-table": (_prepare_table, _execute(scheduling.FCFS)),
+    "sjf-table": (_prepare_table, _execute(scheduling.SJF)),
+    "srtf": (_prepare_list, _execute(scheduling.SRTF)),
+    "rr": (_prepare_list, _execute(scheduling.RoundRobin, quantum=2)),
+    "mlfq": (_prepare_list, _execute(scheduling.MLFQ)),
+}
+if batch_metrics is not None:
+    import numpy as np
+
+    def _prepare_arrays(w: workload.Workload):
+        return workload.Workload(np.asarray(w.arrival), np.asarray(w.burst), w.priority)
+
+    BENCHMARKS["fcfs-numpy"] = (_prepare_arrays, _batch(batch_metrics.fcfs_metrics))
+    BENCHMARKS["sjf-numpy"] = (_prepare_arrays, _batch(batch_metrics.sjf_metrics))
+
+
+def measure(benchmark: str, bursts: str, size: int, repeat: int = 3, seed: int = 0) -> dict:
+    """Best-of-`repeat` wall time and the peak traced memory of one benchmark run.
+
+    Memory is measured in a separate run, since tracemalloc slows down
+    allocation-heavy code and would skew the timings.
+    """
+    prepare, target = BENCHMARKS[benchmark]
+    data = prepare(workload.poisson(size, seed=seed, bursts=bursts))
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        target(data)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        target(data)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "benchmark": benchmark,
+        "bursts": bursts,
+        "size": size,
+        "seconds": min(times),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[dict]:
+    """Pairs results with the baseline and flags those slower or bigger by more than `threshold`."""
+    previous = {(row["benchmark"], row["bursts"], row["size"]): row for row in baseline}
+    rows = []
+    for row in results:
+        old = previous.get((row["benchmark"], row["bursts"], row["size"]))
+        if old is None:
+            continue
+        time_ratio = row["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        memory_ratio = row["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        rows.append(dict(row, time_ratio=time_ratio, memory_ratio=memory_ratio,
+                         regression=time_ratio > 1 + threshold or memory_ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CPU schedulers on synthetic workloads.")
+    parser.add_argument("--benchmark", nargs="+", choices=BENCHMARKS, default=["fcfs", "sjf", "fcfs-table", "sjf-table"])
+    parser.add_argument("--bursts", nargs="+", choices=workload.BURSTS, default=list(workload.BURSTS))
+    parser.add_argument("--sizes", nargs="+", type=lambda text: int(float(text)), default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help="job counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file from an earlier --out run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown or growth, 0.1 is 10%%")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for bursts in args.bursts:
+            for benchmark in args.benchmark:
+                result = measure(benchmark, bursts, size, args.repeat, args.seed)
+                results.append(result)
+                print(f"{benchmark:>12} {bursts:>12} {size:>10,} {result['seconds']:>10.4f}s "
+                      f"{result['peak_bytes'] / 2 ** 20:>10.1f} MiB", flush=True)
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "seed": args.seed, "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        rows = compare(results, baseline, args.threshold)
+        print()
+        headers = ["Benchmark", "Bursts", "Size", "Seconds", "Time Ratio", "Peak MiB", "Memory Ratio", "Status"]
+        TableFormatter(headers, [[row["benchmark"], row["bursts"], row["size"], f"{row['seconds']:.4f}",
+                                  f"{row['time_ratio']:.2f}", f"{row['peak_bytes'] / 2 ** 20:.1f}",
+                                  f"{row['memory_ratio']:.2f}", "REGRESSION" if row["regression"] else "ok"]
+                                 for row in rows]).display_table()
+        regressions = sum(row["regression"] for row in rows)
+        if regressions:
+            print(f"{regressions} regression(s) above {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
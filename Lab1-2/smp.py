@@ -0,0 +1,348 @@
+import argparse
+import heapq
+import importlib
+import random
+from collections.abc import Iterable, Iterator
+
+# The scheduler module name has a hyphen, so it cannot be imported with a plain import statement.
+scheduling = importlib.import_module("OS_Lab1-2")
+Process = scheduling.Process
+Scheduler = scheduling.Scheduler
+
+GLOBAL = 'global'
+PER_CORE = 'per-core'
+WORK_STEALING = 'work-stealing'
+
+
+class SMPSimulator:
+    """Runs any Scheduler policy on several simulated cores.
+
+    The policy is only used through its ready-queue protocol (add_ready,
+    pop_ready, should_preempt, time_slice, ...), with one policy instance per
+    run queue. Load balancing is one of:
+
+    - 'global': all cores share a single run queue.
+    - 'per-core': arrivals go round-robin to per-core queues, no balancing.
+    - 'work-stealing': per-core queues, and a core that runs dry takes work
+      from another core's queue.
+
+    Like PreemptiveScheduler this is event driven: the clock jumps between
+    arrivals and per-core slice ends kept in a heap, so there is no per-tick
+    stepping. With a preemptive policy on the global queue the running
+    processes are kept in a heap on the policy's preemption_rank, so an
+    arrival preempts the worst of them rather than scanning every core.
+    Stolen work carries its policy state, such as its MLFQ level.
+    """
+
+    def __init__(self, process_list: list[Process], policy: type[Scheduler] = scheduling.FCFS,
+                 cores: int = 4, balancing: str = GLOBAL, **policy_options):
+        if cores <= 0:
+            raise ValueError("Need at least one core.")
+        if balancing not in (GLOBAL, PER_CORE, WORK_STEALING):
+            raise ValueError(f"Unknown load balancing mode '{balancing}'.")
+        self.process_list = process_list
+        self.cores = cores
+        self.balancing = balancing
+        self.queues = [policy([], **policy_options)
+                       for _ in range(1 if balancing == GLOBAL else cores)]
+        self.preemptive = type(self.queues[0]).should_preempt is not Scheduler.should_preempt
+        self.completed_processes = []
+
+        self.running = [None] * cores
+        self.slice_start = [0] * cores
+        self.slice_end = [0] * cores
+        self.finish_time = [0] * cores
+        self.version = [0] * cores  # Bumped whenever the core starts a process, so stale entries are skipped
+        self.events = []  # (time, core, version)
+        self.victims = []  # (-preemption rank, core, version) of running processes, global preemptive mode only
+        self.idle = list(range(cores))  # Heap of idle cores, lowest id first, may hold stale entries
+        self.is_idle = [True] * cores
+        self.idle_count = cores
+        self.loaded = {}  # Insertion-ordered set of per-core queues with work
+        self.next_core = 0
+
+        self.current_time = 0
+        self.first_arrival = None
+        self.busy_time = [0] * cores
+        self.context_switches = [0] * cores
+        self.last_process = [None] * cores
+        self.last_core = {}
+        self.migrations = 0
+        self.timeline = None  # Set to a timeline.Timeline to record what ran where
+
+    @property
+    def makespan(self) -> float:
+        if self.first_arrival is None:
+            return 0
+        return self.current_time - self.first_arrival
+
+    def utilisation(self) -> list[float]:
+        makespan = self.makespan
+        return [busy / makespan if makespan else 0.0 for busy in self.busy_time]
+
+    def queue_of(self, core: int) -> Scheduler:
+        return self.queues[0 if self.balancing == GLOBAL else core]
+
+    def execute(self):
+        arrivals = sorted(self.process_list, key=lambda process: process.arrival_time)
+        self.completed_processes.extend(self.stream(arrivals))
+
+    def stream(self, arrivals: Iterable[Process]) -> Iterator[Process]:
+        """Yields processes as they finish, reading arrivals sorted by arrival time."""
+        arrivals = iter(arrivals)
+        upcoming = next(arrivals, None)
+        while True:
+            while self.events and self.events[0][2] != self.version[self.events[0][1]]:
+                heapq.heappop(self.events)
+            if upcoming is not None and (not self.events or upcoming.arrival_time <= self.events[0][0]):
+                if upcoming.arrival_time < self.current_time:
+                    raise ValueError(f"Process '{upcoming.process_id}' arrives out of order.")
+                self.current_time = upcoming.arrival_time
+                if self.first_arrival is None:
+                    self.first_arrival = self.current_time
+                # Queue every arrival at this instant before any core picks one.
+                touched = {}
+                while upcoming is not None and upcoming.arrival_time == self.current_time:
+                    touched[self.enqueue(upcoming)] = None
+                    upcoming = next(arrivals, None)
+                self.dispatch_arrivals(touched)
+                continue
+            if not self.events:
+                break
+            self.current_time, core, _ = heapq.heappop(self.events)
+            finished = self.end_slice(core)
+            if finished is not None:
+                yield finished
+
+    def enqueue(self, process: Process) -> int:
+        """Places an arriving process on a run queue and returns the queue's core."""
+        process.reset()
+        if self.balancing == GLOBAL:
+            core = 0
+        else:
+            core = self.next_core
+            self.next_core = (core + 1) % self.cores
+            self.last_core[process] = core
+            self.loaded[core] = None
+        queue = self.queues[0 if self.balancing == GLOBAL else core]
+        queue.current_time = self.current_time
+        queue.add_ready(process)
+        return core
+
+    def dispatch_arrivals(self, touched: dict[int, None]):
+        """Starts idle cores on new work, or preempts where the policy says so."""
+        if self.balancing == GLOBAL:
+            queue = self.queues[0]
+            queue.on_event(None)
+            while self.idle_count and queue.has_ready():
+                self.schedule(self.pop_idle())
+            if self.preemptive:
+                self.preempt_worst(queue)
+            return
+
+        for core in touched:
+            self.queues[core].on_event(self.running[core])
+            if self.is_idle[core]:
+                self.take_idle(core)
+                self.schedule(core)
+            elif self.preemptive and self.can_preempt(core):
+                self.preempt(core)
+        if self.balancing == WORK_STEALING:
+            while self.idle_count and self.loaded:
+                self.schedule(self.pop_idle())
+
+    def can_preempt(self, core: int) -> bool:
+        # A slice ending at this very instant is handled by its own event, so a
+        # finishing process completes and an expired one is demoted as usual.
+        if self.running[core] is None or self.slice_end[core] <= self.current_time:
+            return False
+        return self.queue_of(core).should_preempt(self.account(core))
+
+    def preempt_worst(self, queue: Scheduler):
+        """Preempts the worst running process for as long as the global queue has a better one."""
+        victims = self.victims
+        ending = []  # Entries for cores whose slice ends now, put back afterwards
+        while victims and queue.has_ready():
+            rank, core, version = victims[0]
+            if self.running[core] is None or version != self.version[core]:
+                heapq.heappop(victims)
+                continue
+            # A rank can only have dropped since it was pushed, as after an MLFQ boost.
+            current = -queue.preemption_rank(self.account(core))
+            if current != rank:
+                heapq.heapreplace(victims, (current, core, version))
+                continue
+            if self.slice_end[core] <= self.current_time:
+                ending.append(heapq.heappop(victims))
+                continue
+            if not self.can_preempt(core):
+                break
+            heapq.heappop(victims)
+            self.preempt(core)
+        for entry in ending:
+            heapq.heappush(victims, entry)
+
+    def pop_idle(self) -> int:
+        while True:
+            core = heapq.heappop(self.idle)
+            if self.is_idle[core]:
+                self.take_idle(core)
+                return core
+
+    def take_idle(self, core: int):
+        # Any heap entry for the core goes stale and is skipped by pop_idle.
+        self.is_idle[core] = False
+        self.idle_count -= 1
+
+    def schedule(self, core: int):
+        """Gives an idle core its next process, stealing one if allowed."""
+        queue = self.queue_of(core)
+        queue.current_time = self.current_time
+        if not queue.has_ready() and self.balancing == WORK_STEALING:
+            self.steal(core)
+        if not queue.has_ready():
+            self.is_idle[core] = True
+            self.idle_count += 1
+            heapq.heappush(self.idle, core)
+            return
+
+        process = queue.pop_ready()
+        if self.balancing != GLOBAL and not queue.has_ready():
+            self.loaded.pop(core, None)
+        if self.last_process[core] is not None and self.last_process[core] is not process:
+            self.context_switches[core] += 1
+        self.last_process[core] = process
+        if self.last_core.get(process, core) != core:
+            self.migrations += 1
+        self.last_core[process] = core
+
+        process.start(self.current_time)
+        self.running[core] = process
+        self.version[core] += 1
+        self.slice_start[core] = self.current_time
+        self.finish_time[core] = self.current_time + process.remaining_time
+        self.slice_end[core] = min(self.finish_time[core],
+                                   self.current_time + queue.time_slice(process))
+        self.push_event(core)
+        if self.balancing == GLOBAL and self.preemptive:
+            self.push_victim(core)
+
+    def push_victim(self, core: int):
+        victims = self.victims
+        heapq.heappush(victims, (-self.queues[0].preemption_rank(self.running[core]), core, self.version[core]))
+        if len(victims) > 2 * self.cores:
+            # Drop entries of processes that have left their core.
+            victims[:] = [entry for entry in victims
+                          if self.running[entry[1]] is not None and entry[2] == self.version[entry[1]]]
+            heapq.heapify(victims)
+
+    def steal(self, core: int):
+        while self.loaded:
+            victim = next(iter(self.loaded))
+            victim_queue = self.queues[victim]
+            if not victim_queue.has_ready():
+                del self.loaded[victim]
+                continue
+            process = victim_queue.pop_ready()
+            state = victim_queue.migrate_out(process)
+            if not victim_queue.has_ready():
+                del self.loaded[victim]
+            self.queues[core].migrate_in(process, state)
+            return
+
+    def push_event(self, core: int):
+        event_time = min(self.slice_end[core], self.queue_of(core).next_timer())
+        heapq.heappush(self.events, (event_time, core, self.version[core]))
+
+    def account(self, core: int) -> Process:
+        """Brings the running process's remaining time and the core's busy time up to date."""
+        process = self.running[core]
+        self.busy_time[core] += self.current_time - self.slice_start[core]
+        if self.timeline is not None:
+            self.timeline.record(core, process.process_id, self.slice_start[core], self.current_time)
+        self.slice_start[core] = self.current_time
+        process.remaining_time = self.finish_time[core] - self.current_time
+        return process
+
+    def preempt(self, core: int):
+        process = self.account(core)
+        queue = self.queue_of(core)
+        queue.requeue(process, expired=False)
+        self.running[core] = None
+        if self.balancing != GLOBAL:
+            self.loaded[core] = None
+        self.schedule(core)
+
+    def end_slice(self, core: int) -> Process:
+        """Handles a slice end or policy timer on a core, returns a finished process."""
+        process = self.account(core)
+        queue = self.queue_of(core)
+        queue.current_time = self.current_time
+        queue.on_event(process)
+        finished = None
+        if self.current_time >= self.finish_time[core]:
+            process.finish(self.current_time)
+            queue.release(process)
+            del self.last_core[process]
+            finished = process
+        elif self.current_time >= self.slice_end[core]:
+            queue.requeue(process, expired=True)
+        elif queue.should_preempt(process):
+            queue.requeue(process, expired=False)
+        else:
+            self.push_event(core)
+            return None
+
+        self.running[core] = None
+        if self.balancing != GLOBAL and queue.has_ready():
+            self.loaded[core] = None
+        self.schedule(core)
+        return finished
+
+    def show(self):
+        """Prints per-core utilisation and the overall migration count and makespan."""
+        print("{:>6}{:>12}{:>14}{:>19}".format("Core", "Busy Time", "Utilisation", "Context Switches"))
+        for core, utilisation in enumerate(self.utilisation()):
+            print(f"{core:>6}{self.busy_time[core]:>12.2f}{utilisation:>14.1%}{self.context_switches[core]:>19}")
+        print(f"Migrations: {self.migrations}")
+        print(f"Makespan: {self.makespan:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a CPU scheduler on several cores.")
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--balancing", choices=(GLOBAL, PER_CORE, WORK_STEALING), default=WORK_STEALING)
+    parser.add_argument("--policy", choices=("fcfs", "sjf", "srtf", "rr", "priority", "mlfq"), default="srtf")
+    parser.add_argument("--quantum", type=float, default=2, help="time quantum for rr")
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    policies = {
+        "fcfs": (scheduling.FCFS, {}),
+        "sjf": (scheduling.SJF, {}),
+        "srtf": (scheduling.SRTF, {}),
+        "rr": (scheduling.RoundRobin, {"quantum": args.quantum}),
+        "priority": (scheduling.PreemptivePriority, {}),
+        "mlfq": (scheduling.MLFQ, {}),
+    }
+    policy, options = policies[args.policy]
+
+    # Keep the offered load at about 90% of the cores whatever their number.
+    rng = random.Random(args.seed)
+    mean_burst = 4
+    mean_gap = mean_burst / (0.9 * args.cores)
+    arrival_time = 0.0
+    process_list = []
+    for process_id in range(args.jobs):
+        arrival_time += rng.expovariate(1 / mean_gap)
+        process_list.append(Process(process_id, arrival_time, rng.expovariate(1 / mean_burst),
+                                    rng.randint(0, 4)))
+
+    smp = SMPSimulator(process_list, policy, args.cores, args.balancing, **options)
+    smp.execute()
+    smp.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import importlib
+import math
+import random
+import struct
+from collections.abc import Iterable, Iterator
+
+# The scheduler module name has a hyphen, so it cannot be imported with a plain import statement.
+scheduling = importlib.import_module("OS_Lab1-2")
+Process = scheduling.Process
+
+POLICIES = {
+    "fcfs": scheduling.FCFS,
+    "sjf": scheduling.SJF,
+    "srtf": scheduling.SRTF,
+    "rr": scheduling.RoundRobin,
+    "priority": scheduling.PreemptivePriority,
+}
+
+# Binary trace record: process id, arrival time, burst time, priority.
+RECORD = struct.Struct("<qddi")
+CHUNK_RECORDS = 65536
+
+
+def _number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_csv_trace(path: str) -> Iterator[Process]:
+    """Lazily reads processes from a CSV file with a header row.
+
+    Columns are process_id, arrival_time, burst_time and an optional priority.
+    """
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            yield Process(row["process_id"], _number(row["arrival_time"]),
+                          _number(row["burst_time"]), int(row.get("priority") or 0))
+
+
+def write_csv_trace(path: str, processes: Iterable[Process]):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["process_id", "arrival_time", "burst_time", "priority"])
+        for process in processes:
+            writer.writerow([process.process_id, process.arrival_time,
+                             process.burst_time, process.priority])
+
+
+def read_binary_trace(path: str) -> Iterator[Process]:
+    """Lazily reads fixed-size records written by write_binary_trace."""
+    with open(path, "rb") as file:
+        while chunk := file.read(RECORD.size * CHUNK_RECORDS):
+            if len(chunk) % RECORD.size:
+                raise ValueError(f"Truncated record in '{path}'.")
+            for process_id, arrival_time, burst_time, priority in RECORD.iter_unpack(chunk):
+                yield Process(process_id, arrival_time, burst_time, priority)
+
+
+def write_binary_trace(path: str, processes: Iterable[Process]):
+    """Writes processes as binary records, the process id must be an integer."""
+    with open(path, "wb") as file:
+        buffer = bytearray()
+        for process in processes:
+            buffer += RECORD.pack(process.process_id, process.arrival_time,
+                                  process.burst_time, process.priority)
+            if len(buffer) >= RECORD.size * CHUNK_RECORDS:
+                file.write(buffer)
+                buffer.clear()
+        file.write(buffer)
+
+
+def poisson_arrivals(count: int, mean_gap: float, mean_burst: float, seed: int = 0) -> Iterator[Process]:
+    """Generates processes with exponential gaps and bursts without storing them."""
+    rng = random.Random(seed)
+    arrival_time = 0.0
+    for process_id in range(count):
+        arrival_time += rng.expovariate(1 / mean_gap)
+        yield Process(process_id, arrival_time, rng.expovariate(1 / mean_burst))
+
+
+class RunningStats:
+    """Running mean and approximate percentiles of a stream of values.
+
+    Percentiles come from a fixed-size reservoir sample, so memory stays
+    bounded and they are exact while fewer than `reservoir_size` values have
+    been seen.
+    """
+
+    def __init__(self, reservoir_size: int = 10000, seed: int = 0):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = -math.inf
+        self.reservoir_size = reservoir_size
+        self.reservoir = []
+        self.rng = random.Random(seed)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(value)
+        else:
+            slot = self.rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, q is between 0 and 100."""
+        if not self.reservoir:
+            return 0.0
+        ordered = sorted(self.reservoir)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class StreamSummary:
+    """Running aggregates over the processes coming out of Scheduler.stream."""
+
+    def __init__(self, reservoir_size: int = 10000):
+        self.waiting = RunningStats(reservoir_size, seed=1)
+        self.turnaround = RunningStats(reservoir_size, seed=2)
+        self.response = RunningStats(reservoir_size, seed=3)
+
+    def track(self, completions: Iterable[Process]) -> Iterator[Process]:
+        """Passes completions through while updating the aggregates."""
+        for process in completions:
+            self.waiting.add(process.waiting_time)
+            self.turnaround.add(process.turnaround_time)
+            self.response.add(process.response_time)
+            yield process
+
+    def show(self):
+        print("{:>12}{:>12}{:>12}{:>12}{:>12}".format("Metric", "Mean", "p50", "p99", "Max"))
+        for name, stats in (("Waiting", self.waiting), ("Turnaround", self.turnaround),
+                            ("Response", self.response)):
+            print(f"{name:>12}{stats.mean:>12.2f}{stats.percentile(50):>12.2f}"
+                  f"{stats.percentile(99):>12.2f}{stats.maximum:>12.2f}")
+        print(f"Processes: {self.waiting.count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a trace through a CPU scheduler.")
+    parser.add_argument("trace", nargs="?", help="CSV or binary (.bin) trace sorted by arrival time")
+    parser.add_argument("--policy", choices=POLICIES, default="sjf")
+    parser.add_argument("--quantum", type=float, default=2, help="time quantum for rr")
+    parser.add_argument("--count", type=int, default=100000, help="generated processes when no trace is given")
+    args = parser.parse_args()
+
+    if args.trace is None:
+        arrivals = poisson_arrivals(args.count, mean_gap=5, mean_burst=4)
+    elif args.trace.endswith(".bin"):
+        arrivals = read_binary_trace(args.trace)
+    else:
+        arrivals = read_csv_trace(args.trace)
+
+    scheduler_class = POLICIES[args.policy]
+    if scheduler_class is scheduling.RoundRobin:
+        scheduler = scheduler_class([], quantum=args.quantum)
+    else:
+        scheduler = scheduler_class([])
+
+    summary = StreamSummary()
+    for _ in summary.track(scheduler.stream(arrivals)):
+        pass
+    summary.show()
+    print(f"Context switches: {scheduler.context_switches}")
+
+
+if __name__ == "__main__":
+    main()
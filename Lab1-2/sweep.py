@@ -0,0 +1,217 @@
+import argparse
+import csv
+import itertools
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import smp
+import workload
+from table_formatter import TableFormatter
+
+scheduling = workload.scheduling
+
+POLICIES = {
+    "fcfs": scheduling.FCFS,
+    "sjf": scheduling.SJF,
+    "srtf": scheduling.SRTF,
+    "rr": scheduling.RoundRobin,
+    "priority": scheduling.PreemptivePriority,
+    "mlfq": scheduling.MLFQ,
+}
+QUANTUM_POLICIES = {"rr"}
+
+# Set in each worker by _attach; maps (seed, cores) to the shared workload columns.
+_shared = None
+_workloads = {}
+
+
+class Config:
+    """One point of the parameter grid."""
+
+    __slots__ = ('policy', 'quantum', 'cores', 'balancing', 'seed')
+
+    def __init__(self, policy: str, quantum: float, cores: int, balancing: str, seed: int):
+        self.policy = policy
+        self.quantum = quantum
+        self.cores = cores
+        self.balancing = balancing
+        self.seed = seed
+
+    def group(self) -> tuple:
+        """Everything but the seed, used to summarise over workloads."""
+        return self.policy, self.quantum, self.cores, self.balancing
+
+
+def grid(policies: list[str], quanta: list[float], cores: list[int], balancing: list[str],
+         seeds: list[int]) -> list[Config]:
+    """Expands the parameter grid, skipping settings a configuration ignores."""
+    configs = {}
+    for policy, quantum, core_count, mode, seed in itertools.product(policies, quanta, cores, balancing, seeds):
+        if policy not in QUANTUM_POLICIES:
+            quantum = None
+        if core_count == 1:
+            mode = None
+        config = Config(policy, quantum, core_count, mode, seed)
+        configs.setdefault(config.group() + (seed,), config)
+    return list(configs.values())
+
+
+def share(workloads: dict[tuple[int, int], workload.Workload]) -> tuple[shared_memory.SharedMemory, dict]:
+    """Copies every workload into one shared memory block.
+
+    Returns the block and a layout mapping each workload key to (offset, length)
+    in doubles, with the arrival, burst and priority columns stored back to back.
+    """
+    total = sum(3 * len(w) for w in workloads.values())
+    block = shared_memory.SharedMemory(create=True, size=max(8, total * 8))
+    doubles = block.buf.cast('d')
+    layout = {}
+    offset = 0
+    for key, w in workloads.items():
+        n = len(w)
+        for column in (w.arrival, w.burst, w.priority):
+            doubles[offset:offset + n] = column
+            offset += n
+        layout[key] = (offset - 3 * n, n)
+    doubles.release()
+    return block, layout
+
+
+def _attach(name: str, layout: dict):
+    global _shared
+    _shared = shared_memory.SharedMemory(name=name)
+    doubles = _shared.buf.cast('d')
+    for key, (offset, n) in layout.items():
+        _workloads[key] = workload.Workload(doubles[offset:offset + n],
+                                             doubles[offset + n:offset + 2 * n],
+                                             doubles[offset + 2 * n:offset + 3 * n])
+
+
+def run(config: Config) -> dict:
+    """Runs one configuration on its shared workload and returns its metrics."""
+    process_list = _workloads[config.seed, config.cores].processes()
+    options = {"quantum": config.quantum} if config.quantum is not None else {}
+    policy = POLICIES[config.policy]
+
+    start = time.perf_counter()
+    if config.cores == 1:
+        scheduler = policy(process_list, **options)
+        scheduler.execute()
+        context_switches, migrations = scheduler.context_switches, 0
+        makespan = scheduler.current_time - min((p.arrival_time for p in process_list), default=0)
+    else:
+        scheduler = smp.SMPSimulator(process_list, policy, config.cores, config.balancing, **options)
+        scheduler.execute()
+        context_switches, migrations = sum(scheduler.context_switches), scheduler.migrations
+        makespan = scheduler.makespan
+    elapsed = time.perf_counter() - start
+
+    waiting = sorted(p.waiting_time for p in scheduler.completed_processes)
+    n = len(waiting)
+    return {
+        "policy": config.policy,
+        "quantum": config.quantum,
+        "cores": config.cores,
+        "balancing": config.balancing,
+        "seed": config.seed,
+        "jobs": n,
+        "mean_waiting": sum(waiting) / n if n else 0.0,
+        "p99_waiting": waiting[max(0, math.ceil(0.99 * n) - 1)] if n else 0.0,
+        "mean_turnaround": sum(p.turnaround_time for p in scheduler.completed_processes) / n if n else 0.0,
+        "mean_response": sum(p.response_time for p in scheduler.completed_processes) / n if n else 0.0,
+        "context_switches": context_switches,
+        "migrations": migrations,
+        "makespan": makespan,
+        "seconds": elapsed,
+    }
+
+
+def sweep(configs: list[Config], workloads: dict[tuple[int, int], workload.Workload],
+          workers: int = None) -> list[dict]:
+    """Runs every configuration over a process pool, workloads go through shared memory."""
+    block, layout = share(workloads)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_attach, initargs=(block.name, layout)) as executor:
+            chunksize = max(1, len(configs) // (4 * (workers or os.cpu_count())))
+            return list(executor.map(run, configs, chunksize=chunksize))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def summarise(results: list[dict]) -> list[dict]:
+    """Averages the metrics of each configuration over its workload seeds."""
+    groups = {}
+    for row in results:
+        key = (row["policy"], row["quantum"], row["cores"], row["balancing"])
+        groups.setdefault(key, []).append(row)
+    summary = []
+    for (policy, quantum, cores, balancing), rows in groups.items():
+        mean_waiting = [row["mean_waiting"] for row in rows]
+        summary.append({
+            "policy": policy,
+            "quantum": quantum,
+            "cores": cores,
+            "balancing": balancing,
+            "runs": len(rows),
+            "mean_waiting": statistics.fmean(mean_waiting),
+            "stdev_waiting": statistics.stdev(mean_waiting) if len(rows) > 1 else 0.0,
+            "p99_waiting": statistics.fmean(row["p99_waiting"] for row in rows),
+            "mean_turnaround": statistics.fmean(row["mean_turnaround"] for row in rows),
+            "context_switches": statistics.fmean(row["context_switches"] for row in rows),
+            "migrations": statistics.fmean(row["migrations"] for row in rows),
+            "makespan": statistics.fmean(row["makespan"] for row in rows),
+        })
+    return sorted(summary, key=lambda row: row["mean_waiting"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parameter sweep over the CPU schedulers.")
+    parser.add_argument("--policy", nargs="+", choices=POLICIES, default=["fcfs", "sjf", "srtf", "rr"])
+    parser.add_argument("--quantum", nargs="+", type=float, default=[2])
+    parser.add_argument("--cores", nargs="+", type=int, default=[1])
+    parser.add_argument("--balancing", nargs="+", choices=(smp.GLOBAL, smp.PER_CORE, smp.WORK_STEALING),
+                        default=[smp.GLOBAL])
+    parser.add_argument("--seed", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--jobs", type=int, default=10000, help="processes per workload")
+    parser.add_argument("--load", type=float, default=0.9, help="offered load per core")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to every CPU")
+    parser.add_argument("--out", help="write every run to this CSV file")
+    args = parser.parse_args()
+
+    configs = grid(args.policy, args.quantum, args.cores, args.balancing, args.seed)
+    # Scale the arrival rate with the core count so each core sees the same load.
+    workloads = {}
+    for config in configs:
+        key = config.seed, config.cores
+        if key not in workloads:
+            workloads[key] = workload.poisson(args.jobs, seed=config.seed, mean_burst=4,
+                                              mean_gap=4 / (args.load * config.cores))
+
+    start = time.perf_counter()
+    results = sweep(configs, workloads, args.workers)
+    print(f"Ran {len(results)} configurations in {time.perf_counter() - start:.2f}s\n")
+
+    if args.out:
+        with open(args.out, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+    headers = ["Policy", "Quantum", "Cores", "Balancing", "Runs", "Mean Wait", "Stdev", "p99 Wait",
+               "Mean TAT", "Switches", "Migrations", "Makespan"]
+    rows = [[row["policy"], row["quantum"] or "-", row["cores"], row["balancing"] or "-", row["runs"],
+             f"{row['mean_waiting']:.2f}", f"{row['stdev_waiting']:.2f}", f"{row['p99_waiting']:.2f}",
+             f"{row['mean_turnaround']:.2f}", f"{row['context_switches']:.0f}",
+             f"{row['migrations']:.0f}", f"{row['makespan']:.2f}"]
+            for row in summarise(results)]
+    TableFormatter(headers, rows).display_table()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import bisect
+import csv
+import importlib
+import json
+import struct
+from array import array
+from collections.abc import Hashable, Iterator
+
+# Binary interval record: start, end, process code, core.
+RECORD = struct.Struct("<ddqi")
+# Binary files are chunks: this header (record count, label table size), the
+# records, then a JSON object mapping the codes they use to process ids.
+CHUNK = struct.Struct("<qq")
+
+
+class Timeline:
+    """Compressed record of which process ran on which core and when.
+
+    Intervals live in typed arrays, one set per core, and a slice that
+    continues the last interval of the same process on that core is merged
+    into it. Process ids are stored as integer codes into `labels`, and a
+    label is forgotten once no interval in memory uses it.
+
+    With a `capacity`, the oldest half of every core is evicted once more
+    intervals than that are held. Evicted intervals are dropped, or appended
+    to the `spill` file as a chunk with their labels, which close() then
+    completes into a file that read_binary() loads. Range queries only see
+    intervals still in memory.
+    """
+
+    def __init__(self, capacity: int = None, spill: str = None):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self.starts = []  # Per core
+        self.ends = []
+        self.codes = []
+        self.labels = {}  # Code -> process id
+        self.label_codes = {}  # Process id -> code
+        self.references = {}  # Code -> intervals in memory using it
+        self.next_code = 0
+        self.size = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.spill = open(spill, "wb") if spill is not None else None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def code(self, process_id: Hashable) -> int:
+        code = self.label_codes.get(process_id)
+        if code is None:
+            code = self.label_codes[process_id] = self.next_code
+            self.labels[code] = process_id
+            self.references[code] = 0
+            self.next_code += 1
+        return code
+
+    def record(self, core: int, process_id: Hashable, start: float, end: float):
+        """Adds a slice, merging it into the core's last interval when it continues it."""
+        if end <= start:
+            return
+        while core >= len(self.starts):
+            self.starts.append(array('d'))
+            self.ends.append(array('d'))
+            self.codes.append(array('q'))
+        ends, codes = self.ends[core], self.codes[core]
+        code = self.code(process_id)
+        if ends and ends[-1] == start and codes[-1] == code:
+            ends[-1] = end
+            return
+        self.starts[core].append(start)
+        ends.append(end)
+        codes.append(code)
+        self.references[code] += 1
+        self.size += 1
+        if self.capacity is not None and self.size > self.capacity:
+            self.evict()
+
+    def evict(self):
+        """Removes the oldest half of every core, spilling it if there is a spill file."""
+        records = []
+        evicted = {}  # Code -> intervals evicted
+        for core in range(len(self.starts)):
+            count = (len(self.starts[core]) + 1) // 2
+            codes = self.codes[core]
+            for i in range(count):
+                evicted[codes[i]] = evicted.get(codes[i], 0) + 1
+            if self.spill is not None:
+                records.extend(RECORD.pack(self.starts[core][i], self.ends[core][i], codes[i], core)
+                               for i in range(count))
+            del self.starts[core][:count]
+            del self.ends[core][:count]
+            del codes[:count]
+            self.size -= count
+        if self.spill is not None:
+            _write_chunk(self.spill, records, {code: self.labels[code] for code in evicted})
+            self.spilled += len(records)
+        else:
+            self.dropped += sum(evicted.values())
+        for code, count in evicted.items():
+            self.references[code] -= count
+            if not self.references[code]:
+                del self.references[code]
+                del self.label_codes[self.labels.pop(code)]
+
+    def between(self, t1: float, t2: float, core: int = None) -> list[tuple]:
+        """Intervals overlapping [t1, t2) as (start, end, process_id, core), by core then time."""
+        cores = range(len(self.starts)) if core is None else [core] if core < len(self.starts) else []
+        result = []
+        for core in cores:
+            # Intervals on a core never overlap, so ends are sorted as well as starts.
+            first = bisect.bisect_right(self.ends[core], t1)
+            last = bisect.bisect_left(self.starts[core], t2)
+            for i in range(first, last):
+                result.append((self.starts[core][i], self.ends[core][i],
+                               self.labels[self.codes[core][i]], core))
+        return result
+
+    def at(self, time: float) -> dict[int, Hashable]:
+        """Maps each busy core to the process running at the given time."""
+        running = {}
+        for core in range(len(self.starts)):
+            i = bisect.bisect_right(self.starts[core], time) - 1
+            if i >= 0 and self.ends[core][i] > time:
+                running[core] = self.labels[self.codes[core][i]]
+        return running
+
+    def intervals(self) -> Iterator[tuple]:
+        for core in range(len(self.starts)):
+            for start, end, code in zip(self.starts[core], self.ends[core], self.codes[core]):
+                yield start, end, self.labels[code], core
+
+    def write_csv(self, path: str):
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["start", "end", "process_id", "core"])
+            writer.writerows(self.intervals())
+
+    def write_binary(self, path: str):
+        with open(path, "wb") as file:
+            self._write_held(file)
+
+    def close(self):
+        """Completes the spill file with the intervals still in memory."""
+        if self.spill is not None:
+            self._write_held(self.spill)
+            self.spill.close()
+            self.spill = None
+
+    def _write_held(self, file):
+        records = [RECORD.pack(start, end, code, core) for core in range(len(self.starts))
+                   for start, end, code in zip(self.starts[core], self.ends[core], self.codes[core])]
+        _write_chunk(file, records, self.labels)
+
+
+def _write_chunk(file, records: list[bytes], labels: dict):
+    labels = json.dumps({str(code): label for code, label in labels.items()}).encode()
+    file.write(CHUNK.pack(len(records), len(labels)))
+    file.write(b"".join(records))
+    file.write(labels)
+
+
+def read_binary(path: str) -> Timeline:
+    """Loads a file written by write_binary or by close() on a spilling timeline."""
+    with open(path, "rb") as file:
+        data = file.read()
+    timeline = Timeline()
+    position = 0
+    while position < len(data):
+        count, label_size = CHUNK.unpack_from(data, position)
+        position += CHUNK.size
+        records = data[position:position + count * RECORD.size]
+        position += count * RECORD.size
+        labels = json.loads(data[position:position + label_size])
+        position += label_size
+        for start, end, code, core in RECORD.iter_unpack(records):
+            timeline.record(core, labels[str(code)], start, end)
+    return timeline
+
+
+def main():
+    # The scheduler module name has a hyphen, so it cannot be imported with a plain import statement.
+    scheduling = importlib.import_module("OS_Lab1-2")
+    Process = scheduling.Process
+
+    process_list = [
+        Process('P1', 0, 8, 3),
+        Process('P2', 1, 4, 1),
+        Process('P3', 2, 9, 4),
+        Process('P4', 3, 5, 2),
+    ]
+    for scheduler in (scheduling.SRTF(process_list), scheduling.RoundRobin(process_list, quantum=2)):
+        scheduler.timeline = Timeline()
+        scheduler.execute()
+        print(f"{type(scheduler).__name__}:")
+        print(" ".join(f"{process_id}[{start:g}-{end:g})"
+                       for start, end, process_id, _ in scheduler.timeline.intervals()))
+        print(f"Between 5 and 12: {[process_id for _, _, process_id, _ in scheduler.timeline.between(5, 12)]}")
+        print(f"Running at 10: {scheduler.timeline.at(10)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import importlib
+import random
+from array import array
+from collections.abc import Callable, Sequence
+
+# The scheduler module name has a hyphen, so it cannot be imported with a plain import statement.
+scheduling = importlib.import_module("OS_Lab1-2")
+Process = scheduling.Process
+
+
+class Workload:
+    """Column-oriented synthetic workload, rows sorted by arrival time.
+
+    The columns can be any float sequence, including memoryview slices over
+    shared memory, so a workload can be rebuilt in another process without
+    copying or pickling it.
+    """
+
+    def __init__(self, arrival: Sequence[float], burst: Sequence[float], priority: Sequence[float]):
+        if not len(arrival) == len(burst) == len(priority):
+            raise ValueError("Workload columns must have the same length.")
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def processes(self) -> list[Process]:
+        return [Process(process_id, arrival_time, burst_time, int(priority))
+                for process_id, (arrival_time, burst_time, priority)
+                in enumerate(zip(self.arrival, self.burst, self.priority))]
+
+
+def exponential_bursts(rng: random.Random, mean_burst: float) -> Callable[[], float]:
+    return lambda: rng.expovariate(1 / mean_burst)
+
+
+def pareto_bursts(rng: random.Random, mean_burst: float, alpha: float = 1.5) -> Callable[[], float]:
+    """Heavy-tailed bursts: most jobs are short, a few are very long."""
+    scale = mean_burst * (alpha - 1) / alpha
+    return lambda: scale * rng.paretovariate(alpha)
+
+
+def bimodal_bursts(rng: random.Random, mean_burst: float, long_share: float = 0.1,
+                   ratio: float = 20.0) -> Callable[[], float]:
+    """Exponential mix of short interactive jobs and `ratio` times longer batch jobs."""
+    short = mean_burst / (1 - long_share + long_share * ratio)
+    long = short * ratio
+    return lambda: rng.expovariate(1 / (long if rng.random() < long_share else short))
+
+
+BURSTS = {
+    "exponential": exponential_bursts,
+    "pareto": pareto_bursts,
+    "bimodal": bimodal_bursts,
+}
+
+
+def poisson(count: int, seed: int = 0, mean_gap: float = 5.0, mean_burst: float = 4.0,
+            priorities: int = 5, bursts: str = "exponential") -> Workload:
+    """Poisson arrivals with uniform priorities and bursts from one of BURSTS.
+
+    Every burst distribution has the same mean, so workloads differ only in
+    their spread and the offered load stays mean_burst / mean_gap.
+    """
+    if bursts not in BURSTS:
+        raise ValueError(f"Unknown burst distribution '{bursts}'.")
+    rng = random.Random(seed)
+    next_burst = BURSTS[bursts](rng, mean_burst)
+    arrival, burst, priority = array('d'), array('d'), array('d')
+    arrival_time = 0.0
+    for _ in range(count):
+        arrival_time += rng.expovariate(1 / mean_gap)
+        arrival.append(arrival_time)
+        burst.append(next_burst())
+        priority.append(rng.randrange(priorities))
+    return Workload(arrival, burst, priority)
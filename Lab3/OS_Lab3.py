@@ -1,5 +1,8 @@
 import math
 
+from allocation_policies import AllocationPolicy, FirstFit
+from free_extents import FreeExtentIndex
+
 
 class File:
     def __init__(self, size: int, name: str):
@@ -18,13 +21,14 @@ class Disk:
             Disk._instance = Disk()
         return Disk._instance
 
-    def __init__(self):
+    def __init__(self, total_size: int = 12288, block_size: int = 512):
         if not hasattr(self, 'initialized'):
-            self.total_size = 12288  # Disk size in bytes
-            self.block_size = 512    # Block size in bytes
+            self.total_size = total_size  # Disk size in bytes
+            self.block_size = block_size  # Block size in bytes
             self.total_blocks = self.total_size // self.block_size
             self.block_status = [Disk.FREE] * self.total_blocks
             self.free_blocks = self.total_blocks
+            self.free_extents = FreeExtentIndex(self.total_blocks)
             self.file_registry = {}
 
     def add_file(self, file_name, start_block, blocks_used):
@@ -46,34 +50,61 @@ class Disk:
         self.update_block_status(
             file_info["start_block"], file_info["blocks_used"], Disk.FREE)
 
+    def move_file(self, file_name, new_start):
+        """Moves a file's blocks to start at `new_start`, which may overlap its current blocks."""
+        if file_name not in self.file_registry:
+            raise KeyError(f"File '{file_name}' not found.")
+        file_info = self.file_registry[file_name]
+        start_block, blocks_used = file_info["start_block"], file_info["blocks_used"]
+        if not blocks_used:
+            file_info["start_block"] = new_start
+            return
+        self.update_block_status(start_block, blocks_used, Disk.FREE)
+        run_start = self.free_extents.run_containing(new_start)
+        if run_start is None or run_start + self.free_extents.runs[run_start] < new_start + blocks_used:
+            self.update_block_status(start_block, blocks_used, Disk.OCCUPIED)
+            raise ValueError(f"Blocks {new_start}-{new_start + blocks_used - 1} are not free.")
+        self.update_block_status(new_start, blocks_used, Disk.OCCUPIED)
+        file_info["start_block"] = new_start
+
     def update_block_status(self, start_block, blocks_used, status):
-        for i in range(blocks_used):
-            self.block_status[start_block + i] = status
+        self.block_status[start_block:start_block + blocks_used] = [status] * blocks_used
         self.free_blocks += blocks_used if status == Disk.FREE else -blocks_used
+        if status == Disk.FREE:
+            self.free_extents.free(start_block, blocks_used)
+        else:
+            self.free_extents.allocate(start_block, blocks_used)
+
+    def find_free_extent(self, blocks_needed):
+        """Returns the first block of the lowest free run of `blocks_needed` blocks, or None."""
+        return self.free_extents.first_fit(blocks_needed)
 
 
 class FileManager:
     """Manages file allocations on the disk."""
 
+    def __init__(self, disk: Disk = None, policy: AllocationPolicy = None):
+        self.disk = disk
+        self.policy = policy or FirstFit()
+
     def allocate(self, file: File):
-        disk = Disk.get_instance()
+        disk = self.disk or Disk.get_instance()
         needed_blocks = math.ceil(file.size / disk.block_size)
 
         if needed_blocks > disk.free_blocks:
             # print("Not enough space.")
             return False
 
-        for start_block in range(disk.total_blocks - needed_blocks + 1):
-            if all(disk.block_status[i] == Disk.FREE for i in range(start_block, start_block + needed_blocks)):
-                disk.add_file(file.name, start_block, needed_blocks)
-                # print(f"Allocated {file.name}")
-                return True
-
-        return False
+        start_block = self.policy.find(disk, needed_blocks)
+        if start_block is None:
+            return False
+        disk.add_file(file.name, start_block, needed_blocks)
+        # print(f"Allocated {file.name}")
+        return True
 
     def delete(self, file_name: str):
         try:
-            Disk.get_instance().delete_file(file_name)
+            (self.disk or Disk.get_instance()).delete_file(file_name)
             # print(f"Deleted {file_name}")
         except KeyError as e:
             print(e)
@@ -1,5 +1,8 @@
 import math
 
+from allocation_policies import AllocationPolicy, FirstFit
+from free_extents import FreeExtentIndex
+
 BLOCK_SIZE = 512
 
 
@@ -13,10 +16,11 @@ class Disk:
     FREE = 0
     OCCUPIED = 1
 
-    def __init__(self):
-        self.total_blocks = 24
+    def __init__(self, total_blocks: int = 24):
+        self.total_blocks = total_blocks
         self.block_status = [Disk.FREE] * self.total_blocks
         self.free_blocks = self.total_blocks
+        self.free_extents = FreeExtentIndex(self.total_blocks)
         self.file_registry = {}
 
     def add_file(self, file_name, start_block, blocks_used):
@@ -28,9 +32,16 @@ class Disk:
         self.update_block_status(start_block, blocks_used, Disk.OCCUPIED)
 
     def update_block_status(self, start_block, blocks_used, status):
-        for i in range(blocks_used):
-            self.block_status[start_block + i] = status
+        self.block_status[start_block:start_block + blocks_used] = [status] * blocks_used
         self.free_blocks += blocks_used if status == Disk.FREE else -blocks_used
+        if status == Disk.FREE:
+            self.free_extents.free(start_block, blocks_used)
+        else:
+            self.free_extents.allocate(start_block, blocks_used)
+
+    def find_free_extent(self, blocks_needed):
+        """Returns the first block of the lowest free run of `blocks_needed` blocks, or None."""
+        return self.free_extents.first_fit(blocks_needed)
 
     def show(self):
         print("{:>10} {:>12} {:>11}".format(
@@ -42,8 +53,9 @@ class Disk:
 
 
 class FileManager:
-    def __init__(self, disk: Disk):
+    def __init__(self, disk: Disk, policy: AllocationPolicy = None):
         self.disk = disk
+        self.policy = policy or FirstFit()
 
     def allocate(self, file: File):
         needed_blocks = math.ceil(file.size / BLOCK_SIZE)
@@ -51,12 +63,11 @@ class FileManager:
         if needed_blocks > self.disk.free_blocks:
             return False
 
-        for start_block in range(self.disk.total_blocks - needed_blocks + 1):
-            if all(self.disk.block_status[i] == Disk.FREE for i in range(start_block, start_block + needed_blocks)):
-                self.disk.add_file(file.name, start_block, needed_blocks)
-                return True
-
-        return False
+        start_block = self.policy.find(self.disk, needed_blocks)
+        if start_block is None:
+            return False
+        self.disk.add_file(file.name, start_block, needed_blocks)
+        return True
 
 
 def main():
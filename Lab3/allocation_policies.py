@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+
+
+class AllocationPolicy(ABC):
+    """Chooses where a contiguous file of `blocks_needed` blocks goes on a disk.
+
+    Best, worst and next fit read the disk's FreeExtentIndex, so they need a
+    Disk from OS_Lab3, OS_Lab3a or OS_Lab3b. First fit also works on any disk
+    with a find_free_extent method, such as BitmapDisk.
+    """
+
+    @abstractmethod
+    def find(self, disk, blocks_needed: int):
+        """Returns the start block for the file, or None if no free run is big enough."""
+        pass
+
+
+class FirstFit(AllocationPolicy):
+    def find(self, disk, blocks_needed: int):
+        return disk.find_free_extent(blocks_needed)
+
+
+class BestFit(AllocationPolicy):
+    def find(self, disk, blocks_needed: int):
+        return disk.free_extents.best_fit(blocks_needed)
+
+
+class WorstFit(AllocationPolicy):
+    def find(self, disk, blocks_needed: int):
+        return disk.free_extents.worst_fit(blocks_needed)
+
+
+class NextFit(AllocationPolicy):
+    """First fit that resumes from where the previous allocation ended and wraps around."""
+
+    def __init__(self):
+        self.rover = 0
+
+    def find(self, disk, blocks_needed: int):
+        if blocks_needed <= 0:
+            return 0
+        index = disk.free_extents
+        start = self.rover
+        if start >= disk.total_blocks:
+            start = 0
+        # Resume from the start of the run the rover is in, if it has been freed since.
+        run_start = index.run_containing(start)
+        if run_start is not None:
+            start = run_start
+        start_block = index.first_fit(blocks_needed, start)
+        if start_block is None and start:
+            start_block = index.first_fit(blocks_needed)
+        if start_block is not None:
+            self.rover = start_block + blocks_needed
+        return start_block
+
+
+POLICIES = {
+    "first": FirstFit,
+    "best": BestFit,
+    "worst": WorstFit,
+    "next": NextFit,
+}
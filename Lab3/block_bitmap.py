@@ -0,0 +1,194 @@
+import math
+import re
+
+from OS_Lab3 import Disk, File, FileManager
+
+NOT_ZERO = re.compile(rb'[^\x00]')
+NOT_FULL = re.compile(rb'[^\xff]')
+
+
+def _trailing_zeros(byte: int) -> int:
+    return (byte & -byte).bit_length() - 1 if byte else 8
+
+
+def _first_zero_run(byte: int, length: int) -> int:
+    """Lowest bit where `length` zero bits start inside the byte, or -1."""
+    run = 0
+    for bit in range(8):
+        if byte >> bit & 1:
+            run = 0
+        else:
+            run += 1
+            if run == length:
+                return bit - length + 1
+    return -1
+
+
+class BlockBitmap:
+    """One bit per block in a bytearray, set when the block is in use.
+
+    Block i is bit i % 8 of byte i // 8. Ranges are set and cleared a whole
+    byte slice at a time, and zero runs are found with bytes.find and regex
+    scans that skip full or empty bytes at C speed. The spare bits of the
+    last byte are kept set, so searches never run past the end.
+    """
+
+    _run_tables = {}  # length -> first zero run of that length in each byte value
+
+    def __init__(self, total_blocks: int):
+        self.total_blocks = total_blocks
+        self.bits = bytearray(math.ceil(total_blocks / 8))
+        if total_blocks % 8:
+            self.bits[-1] = 0xff << (total_blocks % 8) & 0xff
+
+    def __len__(self) -> int:
+        return self.total_blocks
+
+    def __getitem__(self, block: int) -> int:
+        if not 0 <= block < self.total_blocks:
+            raise IndexError("Block out of range.")
+        return self.bits[block >> 3] >> (block & 7) & 1
+
+    def set_range(self, start: int, length: int, used: bool = True):
+        """Marks [start, start + length) as used or free."""
+        if length <= 0:
+            return
+        end = start + length
+        if start < 0 or end > self.total_blocks:
+            raise IndexError("Block range out of range.")
+        bits = self.bits
+        first, last = start >> 3, (end - 1) >> 3
+        head = 0xff << (start & 7) & 0xff
+        tail = 0xff >> (7 - ((end - 1) & 7))
+        if first == last:
+            head &= tail
+        if used:
+            bits[first] |= head
+        else:
+            bits[first] &= ~head & 0xff
+        if first != last:
+            bits[first + 1:last] = (b'\xff' if used else b'\x00') * (last - first - 1)
+            if used:
+                bits[last] |= tail
+            else:
+                bits[last] &= ~tail & 0xff
+
+    def clear_range(self, start: int, length: int):
+        self.set_range(start, length, used=False)
+
+    def count(self, start: int = 0, end: int = None) -> int:
+        """Number of used blocks in [start, end)."""
+        end = self.total_blocks if end is None else end
+        if end <= start:
+            return 0
+        first, last = start >> 3, (end - 1) >> 3
+        word = int.from_bytes(self.bits[first:last + 1], 'little')
+        word >>= start & 7
+        return (word & ((1 << (end - start)) - 1)).bit_count()
+
+    def find_zero_run(self, length: int, start: int = 0):
+        """First block of the lowest run of `length` free blocks at or after `start`, or None."""
+        if length <= 0:
+            return start
+        if length > self.total_blocks - start:
+            return None
+        if length >= 15:
+            return self._find_long_run(length, start)
+        return self._find_short_run(length, start)
+
+    def _find_long_run(self, length: int, start: int):
+        # A run of `length` zero bits always holds (length - 7) // 8 whole zero
+        # bytes, so search for those and then measure the run around them.
+        bits = self.bits
+        zeros = bytes((length - 7) // 8)
+        i = start >> 3
+        while True:
+            j = bits.find(zeros, i)
+            if j < 0:
+                return None
+            run_start = 8 * j
+            if j:
+                run_start -= 8 - bits[j - 1].bit_length()
+            run_start = max(run_start, start)
+            # Only look as far as the byte holding the run's last block.
+            last = (run_start + length - 1) >> 3
+            if last >= len(bits):
+                return None
+            match = NOT_ZERO.search(bits, j + len(zeros), last + 1)
+            if match is None:
+                return run_start
+            k = match.start()
+            if 8 * k + _trailing_zeros(bits[k]) - run_start >= length:
+                return run_start
+            i = k
+
+    def _find_short_run(self, length: int, start: int):
+        # Short runs need not hold a whole zero byte, so walk the bytes that are
+        # not full and carry the zero bits at the top of each into the next.
+        table = self._run_tables.get(length)
+        if table is None:
+            table = self._run_tables[length] = [_first_zero_run(byte, length) for byte in range(256)]
+        bits = self.bits
+        first = start >> 3
+        carry = carry_start = 0
+        previous = first - 2
+        for match in NOT_FULL.finditer(bits, first):
+            i = match.start()
+            byte = bits[i]
+            if i == first:
+                byte |= (1 << (start & 7)) - 1
+            if i != previous + 1:
+                carry = 0
+            previous = i
+            if carry and carry + _trailing_zeros(byte) >= length:
+                return carry_start
+            if table[byte] >= 0:
+                return 8 * i + table[byte]
+            if byte == 0:
+                if not carry:
+                    carry_start = 8 * i
+                carry += 8
+            else:
+                carry = 8 - byte.bit_length()
+                carry_start = 8 * i + 8 - carry
+        return None
+
+
+class BitmapDisk(Disk):
+    """Disk whose block map is a BlockBitmap instead of a list of ints.
+
+    At one bit per block a 1 TiB disk of 4 KiB blocks needs 32 MiB, and
+    allocating or freeing k blocks touches about k / 8 bytes.
+    """
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512):
+        self.total_size = total_size
+        self.block_size = block_size
+        self.total_blocks = self.total_size // self.block_size
+        self.block_status = BlockBitmap(self.total_blocks)
+        self.free_blocks = self.total_blocks
+        self.file_registry = {}
+
+    def update_block_status(self, start_block, blocks_used, status):
+        self.block_status.set_range(start_block, blocks_used, status == Disk.OCCUPIED)
+        self.free_blocks += blocks_used if status == Disk.FREE else -blocks_used
+
+    def find_free_extent(self, blocks_needed):
+        return self.block_status.find_zero_run(blocks_needed)
+
+
+def main():
+    # 4 TiB of 4 KiB blocks.
+    disk = BitmapDisk(total_size=4 * 2 ** 40, block_size=4096)
+    fm = FileManager(disk)
+    for i, size in enumerate([2 ** 30, 5 * 2 ** 20, 3 * 2 ** 40, 2 ** 20]):
+        fm.allocate(File(size, f"file{i + 1}"))
+    fm.delete("file2")
+    fm.allocate(File(2 ** 20, "file5"))
+    print(disk.file_registry)
+    print(f"Bitmap size: {len(disk.block_status.bits) / 2 ** 20:.0f} MiB, "
+          f"used blocks: {disk.block_status.count():,} of {disk.total_blocks:,}")
+
+
+if __name__ == '__main__':
+    main()
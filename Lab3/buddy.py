@@ -0,0 +1,142 @@
+import argparse
+import time
+
+from fragmentation import external_fragmentation, random_operations
+from OS_Lab3 import Disk, File, FileManager
+
+
+class BuddyDisk(Disk):
+    """Disk that hands out blocks with the buddy system.
+
+    Every allocation is rounded up to a power-of-two number of blocks, aligned
+    to its own size. Free blocks are kept in one insertion-ordered set per
+    order, so allocation splits and deletion coalesces in O(log N) steps
+    whatever the disk size. A disk that is not a power of two blocks long
+    starts as several aligned top-level blocks that never merge.
+    """
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512):
+        self.total_size = total_size
+        self.block_size = block_size
+        self.total_blocks = self.total_size // self.block_size
+        self.block_status = [Disk.FREE] * self.total_blocks
+        self.free_blocks = self.total_blocks
+        self.file_registry = {}
+
+        self.max_order = max(0, self.total_blocks.bit_length() - 1)
+        self.free_lists = [{} for _ in range(self.max_order + 1)]  # Ordered sets of free block starts
+        self.free_orders = {}  # Start of each free block -> its order
+        start = 0
+        for order in range(self.max_order, -1, -1):
+            if start + (1 << order) <= self.total_blocks:
+                self._push(start, order)
+                start += 1 << order
+
+    @staticmethod
+    def order_of(blocks_needed):
+        return max(0, blocks_needed - 1).bit_length()
+
+    def _push(self, start, order):
+        self.free_lists[order][start] = None
+        self.free_orders[start] = order
+
+    def _pop(self, start, order):
+        del self.free_lists[order][start]
+        del self.free_orders[start]
+
+    def update_block_status(self, start_block, blocks_used, status):
+        self.block_status[start_block:start_block + blocks_used] = [status] * blocks_used
+        self.free_blocks += blocks_used if status == Disk.FREE else -blocks_used
+
+    def find_free_extent(self, blocks_needed):
+        """Returns the start of the free block that add_file will split, or None."""
+        for order in range(self.order_of(blocks_needed), self.max_order + 1):
+            if self.free_lists[order]:
+                return next(iter(self.free_lists[order]))
+        return None
+
+    def add_file(self, file_name, start_block, blocks_used):
+        if file_name in self.file_registry:
+            raise ValueError(f"File '{file_name}' already exists.")
+        order = self.free_orders.get(start_block)
+        target = self.order_of(blocks_used)
+        if order is None or order < target:
+            raise ValueError(f"No free buddy block of order {target} at block {start_block}.")
+        self._pop(start_block, order)
+        # Split down to the target order, keeping the lower half each time.
+        while order > target:
+            order -= 1
+            self._push(start_block + (1 << order), order)
+
+        self.file_registry[file_name] = {
+            "start_block": start_block,
+            "blocks_used": blocks_used,
+            "order": target
+        }
+        self.update_block_status(start_block, 1 << target, Disk.OCCUPIED)
+
+    def delete_file(self, file_name):
+        if file_name not in self.file_registry:
+            raise KeyError(f"File '{file_name}' not found.")
+        file_info = self.file_registry.pop(file_name)
+        start, order = file_info["start_block"], file_info["order"]
+        self.update_block_status(start, 1 << order, Disk.FREE)
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if self.free_orders.get(buddy) != order:
+                break
+            self._pop(buddy, order)
+            start = min(start, buddy)
+            order += 1
+        self._push(start, order)
+
+    def largest_free(self):
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return 1 << order
+        return 0
+
+    def internal_fragmentation(self):
+        """Share of the allocated blocks that files do not use."""
+        allocated = sum(1 << info["order"] for info in self.file_registry.values())
+        used = sum(info["blocks_used"] for info in self.file_registry.values())
+        return 1 - used / allocated if allocated else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the buddy system with contiguous first fit.")
+    parser.add_argument("--blocks", type=int, default=1 << 17, help="disk size in blocks")
+    parser.add_argument("--operations", type=int, default=50000)
+    parser.add_argument("--max-size", type=int, default=512, help="largest file in blocks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    operations = random_operations(args.operations, args.max_size * block_size, args.seed)
+    print("{:>12} {:>8} {:>12} {:>14} {:>12} {:>10}".format(
+        "Allocator", "Failed", "Free Blocks", "Internal Frag.", "Ext. Frag.", "us / op"))
+    for name, disk_class in (("first-fit", Disk), ("buddy", BuddyDisk)):
+        disk = disk_class(args.blocks * block_size, block_size)
+        fm = FileManager(disk)
+        failed = 0
+        start = time.perf_counter()
+        for opr in operations:
+            action, file_name, *size = opr.split("-")
+            if action == 'add':
+                failed += not fm.allocate(File(int(size[0]), file_name))
+            elif file_name in disk.file_registry:
+                disk.delete_file(file_name)
+        elapsed = time.perf_counter() - start
+
+        if disk_class is BuddyDisk:
+            internal = disk.internal_fragmentation()
+            external = 1 - disk.largest_free() / disk.free_blocks if disk.free_blocks else 0.0
+        else:
+            internal = 0.0
+            external = external_fragmentation(disk)
+        print("{:>12} {:>8} {:>12} {:>14.1%} {:>12.1%} {:>10.2f}".format(
+            name, failed, disk.free_blocks, internal, external, elapsed / len(operations) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
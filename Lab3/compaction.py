@@ -0,0 +1,204 @@
+import argparse
+import bisect
+import math
+import time
+
+from fragmentation import random_operations
+from OS_Lab3 import Disk, File, FileManager
+
+WINDOW_ATTEMPTS = 16
+
+
+class Move:
+    __slots__ = ('file_name', 'source', 'target', 'blocks')
+
+    def __init__(self, file_name: str, source: int, target: int, blocks: int):
+        self.file_name = file_name
+        self.source = source
+        self.target = target
+        self.blocks = blocks
+
+
+def _extents(disk: Disk) -> list[tuple[int, int, str]]:
+    """(start, blocks, name) of every non-empty file, in address order."""
+    return sorted((info["start_block"], info["blocks_used"], name)
+                  for name, info in disk.file_registry.items() if info["blocks_used"])
+
+
+def plan_slide_left(disk: Disk) -> list[Move]:
+    """Full compaction: packs every file towards block 0, leaving one free extent at the end.
+
+    Files already in place stay put, so a disk with a packed prefix only moves
+    the files after its first hole. Applied in order, each move's target is
+    free, since everything before it is already packed.
+    """
+    plan = []
+    position = 0
+    for start, blocks, name in _extents(disk):
+        if start != position:
+            plan.append(Move(name, start, position, blocks))
+        position += blocks
+    return plan
+
+
+def plan_window(disk: Disk, blocks_needed: int):
+    """Frees one extent of `blocks_needed` blocks by moving the fewest blocks, or returns None.
+
+    Every window starting at block 0 or right after a file is scored by the
+    blocks of the files overlapping it, using prefix sums and two pointers.
+    The files in the cheapest window are then moved, largest first, into the
+    best-fitting free extents outside it. If they do not fit, the next
+    cheapest windows are tried, up to WINDOW_ATTEMPTS of them.
+    """
+    if blocks_needed <= 0 or blocks_needed > disk.free_blocks:
+        return None
+    extents = _extents(disk)
+    starts = [start for start, _, _ in extents]
+    prefix = [0]
+    for _, blocks, _ in extents:
+        prefix.append(prefix[-1] + blocks)
+
+    candidates = []
+    first = 0  # First file ending after the window start
+    for window_start in [0] + [start + blocks for start, blocks, _ in extents]:
+        window_end = window_start + blocks_needed
+        if window_end > disk.total_blocks:
+            break
+        while first < len(extents) and extents[first][0] + extents[first][1] <= window_start:
+            first += 1
+        last = bisect.bisect_left(starts, window_end)  # Files from `first` up to here overlap
+        candidates.append((prefix[last] - prefix[first], window_start, first, last))
+    candidates.sort()
+
+    for cost, window_start, first, last in candidates[:WINDOW_ATTEMPTS]:
+        plan = _evacuate(disk, extents[first:last], window_start, window_start + blocks_needed)
+        if plan is not None:
+            return plan
+    return None
+
+
+def _evacuate(disk: Disk, files, window_start: int, window_end: int):
+    # Free extents with the window cut out, bucketed by length for best fit.
+    # There are far fewer distinct lengths than holes, so only `lengths` is kept sorted.
+    holes = {}
+    for start, length in disk.free_extents.runs.items():
+        end = start + length
+        for piece_start, piece_end in ((start, min(end, window_start)), (max(start, window_end), end)):
+            if piece_end > piece_start:
+                holes.setdefault(piece_end - piece_start, []).append(piece_start)
+    lengths = sorted(holes)
+
+    plan = []
+    for start, blocks, name in sorted(files, key=lambda extent: -extent[1]):
+        i = bisect.bisect_left(lengths, blocks)
+        if i == len(lengths):
+            return None
+        length = lengths[i]
+        hole_start = holes[length].pop()
+        if not holes[length]:
+            del holes[length]
+            del lengths[i]
+        if length > blocks:
+            if length - blocks not in holes:
+                bisect.insort(lengths, length - blocks)
+            holes.setdefault(length - blocks, []).append(hole_start + blocks)
+        plan.append(Move(name, start, hole_start, blocks))
+    return plan
+
+
+def moved_blocks(plan: list[Move]) -> int:
+    return sum(move.blocks for move in plan)
+
+
+class Compactor:
+    """Applies a plan in steps that each move about `step_blocks` blocks.
+
+    Other operations may run between steps. A move whose file has since been
+    deleted or moved is skipped. If a move's target is no longer free, the plan
+    is marked stale and stops, and the caller should plan again.
+    """
+
+    def __init__(self, disk: Disk, plan: list[Move]):
+        self.disk = disk
+        self.plan = plan
+        self.next_move = 0
+        self.moved = 0
+        self.stale = False
+
+    @property
+    def done(self) -> bool:
+        return self.stale or self.next_move == len(self.plan)
+
+    def step(self, step_blocks: int) -> int:
+        """Runs moves until `step_blocks` blocks have moved (at least one move), returns the blocks moved."""
+        moved = 0
+        while not self.done and (moved == 0 or moved + self.plan[self.next_move].blocks <= step_blocks):
+            move = self.plan[self.next_move]
+            file_info = self.disk.file_registry.get(move.file_name)
+            if file_info is not None and file_info["start_block"] == move.source:
+                try:
+                    self.disk.move_file(move.file_name, move.target)
+                except ValueError:
+                    self.stale = True
+                    break
+                moved += move.blocks
+            self.next_move += 1
+        self.moved += moved
+        return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare online and offline compaction on one operation stream.")
+    parser.add_argument("--blocks", type=int, default=20000, help="disk size in blocks")
+    parser.add_argument("--operations", type=int, default=50000)
+    parser.add_argument("--max-size", type=int, default=256, help="largest file in blocks")
+    parser.add_argument("--every", type=int, default=5000, help="operations between offline compactions")
+    parser.add_argument("--files", type=int, default=10 ** 6, help="files on the planner timing disk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    operations = random_operations(args.operations, args.max_size * block_size, args.seed)
+    print("{:>10} {:>8} {:>14} {:>8}".format("Strategy", "Failed", "Moved Blocks", "Seconds"))
+    for strategy in ("none", "online", "offline"):
+        disk = Disk(args.blocks * block_size, block_size)
+        fm = FileManager(disk)
+        failed = moved = 0
+        start = time.perf_counter()
+        for count, opr in enumerate(operations, 1):
+            action, name, *size = opr.split("-")
+            if action == 'add':
+                file = File(int(size[0]), name)
+                allocated = fm.allocate(file)
+                if not allocated and strategy == "online":
+                    # Make room for this file only, moving as little as possible.
+                    plan = plan_window(disk, math.ceil(file.size / block_size))
+                    if plan is not None:
+                        compactor = Compactor(disk, plan)
+                        while not compactor.done:
+                            compactor.step(args.max_size)
+                        moved += compactor.moved
+                        allocated = fm.allocate(file)
+                failed += not allocated
+            elif name in disk.file_registry:
+                disk.delete_file(name)
+            if strategy == "offline" and count % args.every == 0:
+                compactor = Compactor(disk, plan_slide_left(disk))
+                compactor.step(math.inf)
+                moved += compactor.moved
+        print("{:>10} {:>8} {:>14} {:>8.2f}".format(strategy, failed, moved, time.perf_counter() - start))
+
+    # Planner timing: one-block files in pairs, with a two-block hole after each pair.
+    disk = Disk(2 * args.files * block_size, block_size)
+    for i in range(args.files):
+        disk.add_file(f"f{i}", 2 * i - i % 2, 1)
+    for name, planner in (("slide-left", plan_slide_left),
+                          ("window", lambda d: plan_window(d, args.files // 4))):
+        start = time.perf_counter()
+        plan = planner(disk)
+        print(f"{name} plan over {args.files:,} files: {len(plan):,} moves, "
+              f"{moved_blocks(plan):,} blocks, {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
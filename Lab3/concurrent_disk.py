@@ -0,0 +1,214 @@
+import argparse
+import itertools
+import math
+import random
+import threading
+import time
+
+from free_extents import FreeExtentIndex
+from OS_Lab3 import Disk, File
+
+
+class BlockGroup:
+    """A fixed range of blocks with its own lock, free count and free-extent index."""
+
+    def __init__(self, first_block: int, total_blocks: int):
+        self.first_block = first_block
+        self.total_blocks = total_blocks
+        self.free_blocks = total_blocks
+        self.free_extents = FreeExtentIndex(total_blocks)  # Block numbers relative to first_block
+        # Copy of free_extents.largest(), written under the lock so other threads can read it without it.
+        self.largest = total_blocks
+        self.lock = threading.Lock()
+
+
+class ConcurrentDisk:
+    """Disk split into block groups that are locked independently.
+
+    A file lives inside one group, so allocations and deletes in different
+    groups never wait on each other. The only shared lock guards the file
+    registry. It is held just long enough to reserve or remove a name, and
+    never while a group lock is held, so the two cannot deadlock.
+
+    Files larger than a group cannot be allocated.
+    """
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512, group_blocks: int = 8192):
+        self.total_size = total_size
+        self.block_size = block_size
+        self.total_blocks = self.total_size // self.block_size
+        self.group_blocks = group_blocks
+        self.block_status = [Disk.FREE] * self.total_blocks
+        self.groups = [BlockGroup(first, min(group_blocks, self.total_blocks - first))
+                       for first in range(0, self.total_blocks, group_blocks)]
+        self.file_registry = {}
+        self.registry_lock = threading.Lock()
+        self.next_group = itertools.count()
+
+    @property
+    def free_blocks(self) -> int:
+        """Sum of the group counts, each read without its lock.
+
+        Exact while no add or delete is running; during one it may count some
+        groups before and others after, so treat it as approximate.
+        """
+        return sum(group.free_blocks for group in self.groups)
+
+    def add_file(self, file_name, blocks_used, first_group=None):
+        """Allocates `blocks_used` contiguous blocks in the first group with room.
+
+        The search starts at `first_group`, or at the next group in turn, so
+        concurrent callers spread over the disk. Returns the start block, or
+        None if no group has a large enough free run.
+        """
+        with self.registry_lock:
+            if file_name in self.file_registry:
+                raise ValueError(f"File '{file_name}' already exists.")
+            self.file_registry[file_name] = None  # Reserved while the blocks are found
+
+        if first_group is None:
+            first_group = next(self.next_group)
+        count = len(self.groups)
+        for i in range(count):
+            group = self.groups[(first_group + i) % count]
+            # An int read without the lock skips full groups; first_fit repeats the check under it.
+            if group.largest < blocks_used:
+                continue
+            with group.lock:
+                offset = group.free_extents.first_fit(blocks_used)
+                if offset is None:
+                    continue
+                group.free_extents.allocate(offset, blocks_used)
+                group.free_blocks -= blocks_used
+                group.largest = group.free_extents.largest()
+                start_block = group.first_block + offset
+                self.block_status[start_block:start_block + blocks_used] = [Disk.OCCUPIED] * blocks_used
+            with self.registry_lock:
+                self.file_registry[file_name] = {"start_block": start_block, "blocks_used": blocks_used}
+            return start_block
+
+        with self.registry_lock:
+            del self.file_registry[file_name]
+        return None
+
+    def delete_file(self, file_name):
+        with self.registry_lock:
+            file_info = self.file_registry.get(file_name)
+            if file_info is None:
+                raise KeyError(f"File '{file_name}' not found.")
+            del self.file_registry[file_name]
+
+        start_block, blocks_used = file_info["start_block"], file_info["blocks_used"]
+        group = self.groups[start_block // self.group_blocks]
+        with group.lock:
+            self.block_status[start_block:start_block + blocks_used] = [Disk.FREE] * blocks_used
+            group.free_extents.free(start_block - group.first_block, blocks_used)
+            group.free_blocks += blocks_used
+            group.largest = group.free_extents.largest()
+
+    def check(self):
+        """Raises AssertionError unless the registry, block map, free counts and indexes agree."""
+        owner = [None] * self.total_blocks
+        for file_name, file_info in self.file_registry.items():
+            assert file_info is not None, f"File '{file_name}' is still reserved."
+            start_block, blocks_used = file_info["start_block"], file_info["blocks_used"]
+            for block in range(start_block, start_block + blocks_used):
+                assert owner[block] is None, f"Block {block} belongs to '{owner[block]}' and '{file_name}'."
+                owner[block] = file_name
+        for block, status in enumerate(self.block_status):
+            assert (status == Disk.OCCUPIED) == (owner[block] is not None), f"Block {block} is out of sync."
+        for group in self.groups:
+            free = self.block_status[group.first_block:group.first_block + group.total_blocks].count(Disk.FREE)
+            assert group.free_blocks == free == sum(group.free_extents.runs.values())
+            assert group.largest == group.free_extents.largest()
+        assert self.free_blocks == self.block_status.count(Disk.FREE)
+
+
+class ConcurrentFileManager:
+    """FileManager for a ConcurrentDisk, safe to share between threads."""
+
+    def __init__(self, disk: ConcurrentDisk):
+        self.disk = disk
+
+    def allocate(self, file: File):
+        needed_blocks = math.ceil(file.size / self.disk.block_size)
+        return self.disk.add_file(file.name, needed_blocks) is not None
+
+    def delete(self, file_name: str):
+        try:
+            self.disk.delete_file(file_name)
+            return True
+        except KeyError:
+            return False
+
+
+def stress(disk: ConcurrentDisk, threads: int, operations: int, max_size: int, hold: float = 0.0,
+           seed: int = 0) -> float:
+    """Runs random adds and deletes from several threads and returns operations per second.
+
+    Each thread deletes a random file it may or may not own, so threads also
+    race on each other's files. `hold` seconds are spent inside every group
+    lock to stand in for metadata I/O, which is where coarse locking hurts.
+    """
+    fm = ConcurrentFileManager(disk)
+    names = [f"t{t}-f{i}" for t in range(threads) for i in range(operations // threads)]
+    if hold:
+        for group in disk.groups:
+            group.lock = _SlowLock(group.lock, hold)
+
+    def worker(t: int):
+        rng = random.Random(seed * 1000 + t)
+        for i in range(operations // threads):
+            if rng.random() < 0.5:
+                fm.allocate(File(rng.randint(1, max_size) * disk.block_size, f"t{t}-f{i}"))
+            else:
+                fm.delete(rng.choice(names))
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if hold:
+        for group in disk.groups:
+            group.lock = group.lock.lock
+    return operations // threads * threads / elapsed
+
+
+class _SlowLock:
+    def __init__(self, lock: threading.Lock, hold: float):
+        self.lock = lock
+        self.hold = hold
+
+    def __enter__(self):
+        self.lock.acquire()
+        time.sleep(self.hold)
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test the concurrent disk from several threads.")
+    parser.add_argument("--blocks", type=int, default=1 << 18, help="disk size in blocks")
+    parser.add_argument("--groups", nargs="+", type=int, default=[1, 4, 32], help="block group counts to compare")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--operations", type=int, default=40000)
+    parser.add_argument("--max-size", type=int, default=64, help="largest file in blocks")
+    parser.add_argument("--hold", type=float, default=0.0, help="seconds held inside a group lock per operation")
+    args = parser.parse_args()
+
+    block_size = 512
+    print("{:>8} {:>8} {:>12} {:>12}".format("Groups", "Threads", "Ops/s", "Invariants"))
+    for groups in args.groups:
+        for threads in args.threads:
+            disk = ConcurrentDisk(args.blocks * block_size, block_size, math.ceil(args.blocks / groups))
+            ops = stress(disk, threads, args.operations, args.max_size, args.hold)
+            disk.check()
+            print("{:>8} {:>8} {:>12,.0f} {:>12}".format(groups, threads, ops, "ok"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+from free_extents import SortedList
+from OS_Lab3 import Disk, File, FileManager
+
+
+class Request:
+    __slots__ = ('id', 'arrival', 'block', 'write', 'cylinder')
+
+    def __init__(self, id: int, arrival: float, block: int, write: bool = False):
+        self.id = id
+        self.arrival = arrival  # Milliseconds
+        self.block = block
+        self.write = write
+        self.cylinder = None  # Set by the simulator from the disk geometry
+
+
+class DiskModel:
+    """Geometry and timing of a spinning disk, one block per sector.
+
+    A seek of d > 0 cylinders takes `settle` + `per_cylinder` * d ms. The
+    platter turns at `rpm`, so after a seek the head waits until the target
+    sector comes round, then reads or writes it in one sector time.
+    """
+
+    def __init__(self, total_blocks: int, sectors_per_track: int = 64, heads: int = 4, rpm: int = 7200,
+                 settle: float = 0.5, per_cylinder: float = 0.01):
+        self.sectors_per_track = sectors_per_track
+        self.blocks_per_cylinder = sectors_per_track * heads
+        self.cylinders = max(1, math.ceil(total_blocks / self.blocks_per_cylinder))
+        self.rotation = 60000 / rpm  # Milliseconds per revolution
+        self.sector_time = self.rotation / sectors_per_track
+        self.settle = settle
+        self.per_cylinder = per_cylinder
+
+    def cylinder_of(self, block: int) -> int:
+        return block // self.blocks_per_cylinder
+
+    def seek_time(self, distance: int) -> float:
+        return self.settle + self.per_cylinder * distance if distance else 0.0
+
+    def rotation_wait(self, clock: float, block: int) -> float:
+        under_head = clock % self.rotation / self.sector_time
+        return (block % self.sectors_per_track - under_head) % self.sectors_per_track * self.sector_time
+
+
+class DiskScheduler(ABC):
+    """Queue of pending requests that picks the next one to serve.
+
+    pop() returns the request and the cylinders the head sweeps through on
+    the way to it, such as the edge of the disk for SCAN.
+    """
+
+    def __init__(self, cylinders: int):
+        self.cylinders = cylinders
+
+    @abstractmethod
+    def add(self, request: Request):
+        pass
+
+    @abstractmethod
+    def pop(self, head: int) -> tuple[Request, list[int]]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class FCFS(DiskScheduler):
+    def __init__(self, cylinders: int):
+        super().__init__(cylinders)
+        self.queue = deque()
+
+    def add(self, request):
+        self.queue.append(request)
+
+    def pop(self, head):
+        return self.queue.popleft(), []
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class SortedScheduler(DiskScheduler):
+    """Keeps requests as (cylinder, id, request) in a SortedList, so each dispatch is O(log n)."""
+
+    def __init__(self, cylinders: int):
+        super().__init__(cylinders)
+        self.queue = SortedList()
+
+    def add(self, request):
+        self.queue.add((request.cylinder, request.id, request))
+
+    def _take(self, entry):
+        self.queue.remove(entry)
+        return entry[2]
+
+    def above(self, cylinder):
+        """Lowest entry at or above `cylinder`."""
+        return self.queue.ceiling((cylinder, -1))
+
+    def below(self, cylinder):
+        """Highest entry at or below `cylinder`."""
+        return self.queue.floor((cylinder + 1, -1))
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class SSTF(SortedScheduler):
+    def pop(self, head):
+        up, down = self.above(head), self.below(head)
+        if up is None or (down is not None and head - down[0] < up[0] - head):
+            return self._take(down), []
+        return self._take(up), []
+
+
+class SCAN(SortedScheduler):
+    """Elevator: serves requests in the current direction, then turns round at the edge of the disk."""
+
+    TO_EDGE = True
+
+    def __init__(self, cylinders: int):
+        super().__init__(cylinders)
+        self.direction = 1
+
+    def pop(self, head):
+        entry = self.above(head) if self.direction > 0 else self.below(head)
+        if entry is not None:
+            return self._take(entry), []
+        edge = self.cylinders - 1 if self.direction > 0 else 0
+        self.direction = -self.direction
+        entry = self.above(head) if self.direction > 0 else self.below(head)
+        return self._take(entry), [edge] if self.TO_EDGE and edge != head else []
+
+
+class LOOK(SCAN):
+    """SCAN that turns round at the last request instead of the edge."""
+
+    TO_EDGE = False
+
+
+class CSCAN(SortedScheduler):
+    """Serves requests upwards only, then returns to cylinder 0 in one sweep that serves nothing."""
+
+    def pop(self, head):
+        entry = self.above(head)
+        if entry is not None:
+            return self._take(entry), []
+        edge = self.cylinders - 1
+        return self._take(self.above(0)), [edge, 0] if edge != head else [0]
+
+
+SCHEDULERS = {
+    "fcfs": FCFS,
+    "sstf": SSTF,
+    "scan": SCAN,
+    "c-scan": CSCAN,
+    "look": LOOK,
+}
+
+
+class ScheduleStats:
+    def __init__(self, served: int, head_movement: int, latencies: array, elapsed: float):
+        self.served = served
+        self.head_movement = head_movement  # Cylinders, including sweeps to the edge
+        self.elapsed = elapsed  # Milliseconds from the first arrival to the last completion
+        latencies = sorted(latencies)
+        self.mean_latency = sum(latencies) / served if served else 0.0
+        self.p99_latency = latencies[math.ceil(0.99 * served) - 1] if served else 0.0
+        self.throughput = served / elapsed * 1000 if elapsed else 0.0  # Requests per second
+
+
+def simulate(requests: Iterable[Request], scheduler: DiskScheduler, model: DiskModel, head: int = 0) -> ScheduleStats:
+    """Serves requests, given in arrival order, one at a time with the scheduler's choice.
+
+    Every request that has arrived when the head becomes free is in the queue
+    for the next dispatch. Latency runs from arrival to the end of the
+    transfer.
+    """
+    requests = iter(requests)
+    incoming = next(requests, None)
+    first_arrival = incoming.arrival if incoming is not None else 0.0
+    clock = first_arrival
+    head_movement = 0
+    latencies = array('d')
+    while True:
+        while incoming is not None and incoming.arrival <= clock:
+            incoming.cylinder = model.cylinder_of(incoming.block)
+            scheduler.add(incoming)
+            incoming = next(requests, None)
+        if not scheduler:
+            if incoming is None:
+                break
+            clock = incoming.arrival
+            continue
+
+        request, sweep = scheduler.pop(head)
+        for cylinder in sweep + [request.cylinder]:
+            distance = abs(cylinder - head)
+            head_movement += distance
+            clock += model.seek_time(distance)
+            head = cylinder
+        clock += model.rotation_wait(clock, request.block) + model.sector_time
+        latencies.append(clock - request.arrival)
+    return ScheduleStats(len(latencies), head_movement, latencies, clock - first_arrival)
+
+
+def file_requests(disk: Disk, count: int, rate: float = 0.0, write_share: float = 0.3,
+                  seed: int = 0) -> Iterator[Request]:
+    """Yields requests for random blocks of the files on the disk.
+
+    Arrivals are a Poisson process of `rate` requests per second, or all at
+    time 0 if `rate` is 0, which fills the queue with `count` requests at once.
+    """
+    rng = random.Random(seed)
+    extents = [(info["start_block"], info["blocks_used"]) for info in disk.file_registry.values()
+               if info["blocks_used"]]
+    if not extents:
+        raise ValueError("The disk has no file blocks to request.")
+    arrival = 0.0
+    for i in range(count):
+        if rate:
+            arrival += rng.expovariate(rate / 1000)
+        start, blocks = rng.choice(extents)
+        yield Request(i, arrival, start + rng.randrange(blocks), rng.random() < write_share)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare disk arm schedulers on requests for file blocks.")
+    parser.add_argument("--blocks", type=int, default=1 << 20, help="disk size in blocks")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=150.0, help="arrivals per second, 0 queues every request at once")
+    parser.add_argument("--write-share", type=float, default=0.3)
+    parser.add_argument("--sectors", type=int, default=64, help="sectors per track")
+    parser.add_argument("--heads", type=int, default=4)
+    parser.add_argument("--rpm", type=int, default=7200)
+    parser.add_argument("--settle", type=float, default=0.5, help="fixed cost of a seek in ms")
+    parser.add_argument("--per-cylinder", type=float, default=0.01, help="seek cost per cylinder in ms")
+    parser.add_argument("--schedulers", nargs="+", choices=SCHEDULERS, default=list(SCHEDULERS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    disk = Disk(args.blocks * block_size, block_size)
+    fm = FileManager(disk)
+    rng = random.Random(args.seed)
+    for i in range(args.files):
+        fm.allocate(File(rng.randint(1, 2 * args.blocks // args.files) * block_size, f"f{i}"))
+    model = DiskModel(disk.total_blocks, args.sectors, args.heads, args.rpm, args.settle, args.per_cylinder)
+
+    print("{:>8} {:>16} {:>12} {:>12} {:>10} {:>10}".format(
+        "Policy", "Head Movement", "Mean (ms)", "p99 (ms)", "Req / s", "Seconds"))
+    for name in args.schedulers:
+        requests = file_requests(disk, args.requests, args.rate, args.write_share, args.seed)
+        start = time.perf_counter()
+        stats = simulate(requests, SCHEDULERS[name](model.cylinders), model)
+        print("{:>8} {:>16,} {:>12.2f} {:>12.2f} {:>10.1f} {:>10.2f}".format(
+            name, stats.head_movement, stats.mean_latency, stats.p99_latency, stats.throughput,
+            time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
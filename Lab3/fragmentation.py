@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+
+from allocation_policies import POLICIES, AllocationPolicy
+from OS_Lab3 import Disk, File, FileManager
+
+
+def random_operations(count: int, max_size: int, seed: int = 0, delete_share: float = 0.5) -> list[str]:
+    """Random 'add-<name>-<size>' and 'del-<name>' operations, in the format main() in OS_Lab3 reads."""
+    rng = random.Random(seed)
+    live = []
+    operations = []
+    for i in range(count):
+        if live and rng.random() < delete_share:
+            operations.append(f"del-{live.pop(rng.randrange(len(live)))}")
+        else:
+            operations.append(f"add-f{i}-{rng.randint(1, max_size)}")
+            live.append(f"f{i}")
+    return operations
+
+
+def replay(operations: list[str], policy: AllocationPolicy, total_size: int, block_size: int = 512) -> dict:
+    """Runs the operations on a fresh disk and returns its fragmentation figures."""
+    disk = Disk(total_size, block_size)
+    fm = FileManager(disk, policy)
+    failed = 0
+    fragmentation_sum = 0.0
+    start = time.perf_counter()
+    for opr in operations:
+        action, name, *size = opr.split("-")
+        if action == 'add':
+            failed += not fm.allocate(File(int(size[0]), name))
+        elif action == 'del' and name in disk.file_registry:
+            disk.delete_file(name)
+        fragmentation_sum += external_fragmentation(disk)
+    elapsed = time.perf_counter() - start
+    return {
+        "holes": len(disk.free_extents),
+        "largest_hole": disk.free_extents.largest(),
+        "free_blocks": disk.free_blocks,
+        "external_fragmentation": external_fragmentation(disk),
+        "mean_external_fragmentation": fragmentation_sum / len(operations) if operations else 0.0,
+        "failed": failed,
+        "seconds": elapsed,
+    }
+
+
+def external_fragmentation(disk: Disk) -> float:
+    """Share of the free space outside the largest hole, 0 when it is all in one piece."""
+    if not disk.free_blocks:
+        return 0.0
+    return 1 - disk.free_extents.largest() / disk.free_blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare contiguous allocation policies on one operation stream.")
+    parser.add_argument("--policy", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--blocks", type=int, default=100000, help="disk size in blocks")
+    parser.add_argument("--operations", type=int, default=50000)
+    parser.add_argument("--max-size", type=int, default=128, help="largest file in blocks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    operations = random_operations(args.operations, args.max_size * block_size, args.seed)
+    print("{:>8} {:>8} {:>13} {:>12} {:>11} {:>16} {:>8} {:>9}".format(
+        "Policy", "Holes", "Largest Hole", "Free Blocks", "Ext. Frag.", "Mean Ext. Frag.", "Failed", "Seconds"))
+    for name in args.policy:
+        report = replay(operations, POLICIES[name](), args.blocks * block_size, block_size)
+        print("{:>8} {:>8} {:>13} {:>12} {:>11.1%} {:>16.1%} {:>8} {:>9.2f}".format(
+            name, report['holes'], report['largest_hole'], report['free_blocks'],
+            report['external_fragmentation'], report['mean_external_fragmentation'],
+            report['failed'], report['seconds']))
+
+
+if __name__ == '__main__':
+    main()
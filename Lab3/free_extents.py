@@ -0,0 +1,207 @@
+import bisect
+from array import array
+
+
+class SortedList:
+    """Sorted list kept as short sorted sublists, so an insert or removal only shifts a few hundred items."""
+
+    LOAD = 512
+
+    def __init__(self):
+        self.lists = []
+        self.maxes = []  # Last item of each sublist
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for sublist in self.lists:
+            yield from sublist
+
+    def add(self, item):
+        self.size += 1
+        if not self.lists:
+            self.lists.append([item])
+            self.maxes.append(item)
+            return
+        i = min(bisect.bisect_left(self.maxes, item), len(self.maxes) - 1)
+        sublist = self.lists[i]
+        bisect.insort(sublist, item)
+        self.maxes[i] = sublist[-1]
+        if len(sublist) > 2 * self.LOAD:
+            self.lists[i:i + 1] = [sublist[:self.LOAD], sublist[self.LOAD:]]
+            self.maxes[i:i + 1] = [sublist[self.LOAD - 1], sublist[-1]]
+
+    def remove(self, item):
+        i = bisect.bisect_left(self.maxes, item)
+        sublist = self.lists[i]
+        del sublist[bisect.bisect_left(sublist, item)]
+        self.size -= 1
+        if sublist:
+            self.maxes[i] = sublist[-1]
+        else:
+            del self.lists[i]
+            del self.maxes[i]
+
+    def ceiling(self, item):
+        """Smallest item not below `item`, or None."""
+        i = bisect.bisect_left(self.maxes, item)
+        if i == len(self.maxes):
+            return None
+        sublist = self.lists[i]
+        return sublist[bisect.bisect_left(sublist, item)]
+
+    def floor(self, item):
+        """Largest item below `item`, or None."""
+        i = bisect.bisect_left(self.maxes, item)
+        if i < len(self.lists):
+            j = bisect.bisect_left(self.lists[i], item)
+            if j:
+                return self.lists[i][j - 1]
+        return self.maxes[i - 1] if i else None
+
+    def last(self):
+        return self.maxes[-1] if self.maxes else None
+
+
+class FreeExtentIndex:
+    """Index of the free runs of blocks on a disk.
+
+    A max segment tree over start blocks holds the length of the free run
+    starting at each block (0 elsewhere), so the lowest-addressed run of at
+    least k blocks is found in O(log n). Two dicts map run starts to lengths
+    and run ends to starts, so a freed range merges with its neighbours in O(1)
+    before the tree is updated. A SortedList of (length, start) answers
+    best-fit and worst-fit queries with a bisect.
+    """
+
+    def __init__(self, total_blocks: int):
+        self.total_blocks = total_blocks
+        self.size = 1
+        while self.size < max(1, total_blocks):
+            self.size *= 2
+        self.tree = array('q', bytes(16 * self.size))
+        self.runs = {}  # start -> length
+        self.run_ends = {}  # end (exclusive) -> start
+        self.by_size = SortedList()  # (length, start)
+        if total_blocks:
+            self._add_run(0, total_blocks)
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def _set(self, block: int, length: int):
+        i = block + self.size
+        tree = self.tree
+        tree[i] = length
+        # Carry the new maximum up, comparing with the sibling at each level.
+        while i > 1:
+            sibling = tree[i ^ 1]
+            if sibling > length:
+                length = sibling
+            i >>= 1
+            if tree[i] == length:
+                break
+            tree[i] = length
+
+    def _add_run(self, start: int, length: int):
+        self.runs[start] = length
+        self.run_ends[start + length] = start
+        self.by_size.add((length, start))
+        self._set(start, length)
+
+    def _remove_run(self, start: int) -> int:
+        length = self.runs.pop(start)
+        del self.run_ends[start + length]
+        self.by_size.remove((length, start))
+        self._set(start, 0)
+        return length
+
+    def first_fit(self, length: int, start: int = 0):
+        """Start of the lowest free run of at least `length` blocks at or after `start`, or None."""
+        if length <= 0:
+            return start
+        tree = self.tree
+        if start == 0:
+            if tree[1] < length:
+                return None
+            i = 1
+        else:
+            # Climb from the start leaf until a right sibling subtree holds a fit.
+            if start >= self.total_blocks:
+                return None
+            i = start + self.size
+            if tree[i] < length:
+                while True:
+                    if i == 1:
+                        return None
+                    if i % 2 == 0 and tree[i + 1] >= length:
+                        i += 1
+                        break
+                    i //= 2
+        while i < self.size:
+            i = 2 * i if tree[2 * i] >= length else 2 * i + 1
+        return i - self.size
+
+    def best_fit(self, length: int):
+        """Start of the smallest free run of at least `length` blocks, lowest address on ties."""
+        if length <= 0:
+            return 0
+        fit = self.by_size.ceiling((length, -1))
+        return fit[1] if fit is not None else None
+
+    def worst_fit(self, length: int):
+        """Start of the largest free run if it holds `length` blocks, lowest address on ties."""
+        if length <= 0:
+            return 0
+        largest = self.largest()
+        if largest < length:
+            return None
+        return self.by_size.ceiling((largest, -1))[1]
+
+    def largest(self) -> int:
+        return self.by_size.last()[0] if self.by_size else 0
+
+    def run_containing(self, block: int):
+        """Start of the free run that contains `block`, or None if the block is in use."""
+        tree = self.tree
+        i = block + self.size
+        if tree[i]:
+            return block
+        # Walk up to the nearest subtree on the left holding a run, then down to its last run.
+        while i > 1:
+            if i % 2 and tree[i - 1]:
+                i -= 1
+                while i < self.size:
+                    i = 2 * i + 1 if tree[2 * i + 1] else 2 * i
+                start = i - self.size
+                return start if start + self.runs[start] > block else None
+            i //= 2
+        return None
+
+    def allocate(self, start: int, length: int):
+        """Marks [start, start + length) as used, splitting the run that holds it."""
+        if length <= 0:
+            return
+        run_start = self.run_containing(start)
+        if run_start is None or run_start + self.runs[run_start] < start + length:
+            raise ValueError(f"Blocks {start}-{start + length - 1} are not free.")
+        run_length = self._remove_run(run_start)
+        if start > run_start:
+            self._add_run(run_start, start - run_start)
+        end = start + length
+        if end < run_start + run_length:
+            self._add_run(end, run_start + run_length - end)
+
+    def free(self, start: int, length: int):
+        """Marks [start, start + length) as free, merging it with adjacent free runs."""
+        if length <= 0:
+            return
+        end = start + length
+        if end in self.runs:
+            end += self._remove_run(end)
+        if start in self.run_ends:
+            start = self.run_ends[start]
+            self._remove_run(start)
+        self._add_run(start, end - start)
@@ -0,0 +1,139 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable
+
+from OS_Lab3 import Disk, File, FileManager
+
+MAGIC = b'OSLAB3DK'
+# Superblock: magic, total size, block size, registry offset, registry length.
+SUPERBLOCK = struct.Struct("<8sqqqq")
+HEADER_SIZE = 4096
+
+
+class MappedDisk(Disk):
+    """Disk whose blocks live in a memory-mapped image file.
+
+    The image is a header block, the data blocks, then the file registry as
+    JSON. The header points at the registry, so reopening an image rebuilds
+    the disk from the registry without replaying any operations. Reads return
+    memoryview slices of the mapping, and writes copy straight into it.
+
+    Views returned by read() must be released before close().
+    """
+
+    def __init__(self, path: str, total_size: int = 12288, block_size: int = 512):
+        self.path = path
+        exists = os.path.exists(path)
+        if exists:
+            with open(path, "rb") as file:
+                magic, total_size, block_size, registry_offset, registry_length = \
+                    SUPERBLOCK.unpack(file.read(SUPERBLOCK.size))
+                if magic != MAGIC:
+                    raise ValueError(f"'{path}' is not a disk image.")
+                file.seek(registry_offset)
+                registry = json.loads(file.read(registry_length) or b"{}")
+        super().__init__(total_size, block_size)
+
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.file.truncate(HEADER_SIZE + self.total_size)
+        self.map = mmap.mmap(self.file.fileno(), HEADER_SIZE + self.total_size)
+        self.view = memoryview(self.map)
+        if exists:
+            for file_name, file_info in registry.items():
+                self.add_file(file_name, file_info["start_block"], file_info["blocks_used"])
+                self.file_registry[file_name]["size"] = file_info["size"]
+        else:
+            self.flush()
+
+    def add_file(self, file_name, start_block, blocks_used):
+        super().add_file(file_name, start_block, blocks_used)
+        self.file_registry[file_name]["size"] = 0
+
+    def move_file(self, file_name, new_start):
+        """Moves the file's blocks and their bytes, which may overlap, within the mapping."""
+        if file_name not in self.file_registry:
+            raise KeyError(f"File '{file_name}' not found.")
+        old_start = self.file_registry[file_name]["start_block"]
+        super().move_file(file_name, new_start)
+        self.map.move(HEADER_SIZE + new_start * self.block_size, HEADER_SIZE + old_start * self.block_size,
+                      self.file_registry[file_name]["blocks_used"] * self.block_size)
+
+    def _span(self, file_name, offset, length):
+        file_info = self.file_registry[file_name]
+        capacity = file_info["blocks_used"] * self.block_size
+        if offset < 0 or offset + length > capacity:
+            raise ValueError(f"File '{file_name}' holds {capacity} bytes, cannot access {offset}-{offset + length}.")
+        start = HEADER_SIZE + file_info["start_block"] * self.block_size + offset
+        return file_info, start
+
+    def write(self, file_name, data, offset: int = 0):
+        """Copies bytes into the file's blocks, growing its size if they extend it."""
+        data = memoryview(data).cast('B')
+        file_info, start = self._span(file_name, offset, len(data))
+        self.view[start:start + len(data)] = data
+        file_info["size"] = max(file_info["size"], offset + len(data))
+
+    def write_stream(self, file_name, chunks: Iterable[bytes], offset: int = 0) -> int:
+        """Writes chunks one after another from `offset` and returns the bytes written."""
+        position = offset
+        for chunk in chunks:
+            self.write(file_name, chunk, position)
+            position += len(chunk)
+        return position - offset
+
+    def read(self, file_name, offset: int = 0, length: int = None) -> memoryview:
+        """Returns a view of the file's bytes in the mapping, without copying them."""
+        if length is None:
+            length = max(0, self.file_registry[file_name]["size"] - offset)
+        _, start = self._span(file_name, offset, length)
+        return self.view[start:start + length]
+
+    def flush(self):
+        """Writes the registry after the data blocks and points the header at it."""
+        registry = json.dumps({file_name: {"start_block": info["start_block"],
+                                           "blocks_used": info["blocks_used"],
+                                           "size": info["size"]}
+                               for file_name, info in self.file_registry.items()}).encode()
+        registry_offset = HEADER_SIZE + self.total_size
+        self.file.seek(registry_offset)
+        self.file.write(registry)
+        self.file.truncate()
+        self.file.flush()
+        self.map[:SUPERBLOCK.size] = SUPERBLOCK.pack(MAGIC, self.total_size, self.block_size,
+                                                    registry_offset, len(registry))
+        self.map.flush()
+
+    def close(self):
+        self.flush()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+
+def main():
+    path = "disk.img"
+    if os.path.exists(path):
+        os.remove(path)
+
+    disk = MappedDisk(path, total_size=1 << 20, block_size=4096)
+    fm = FileManager(disk)
+    contents = {"notes": b"Operating systems lab 3\n" * 100, "log": bytes(range(256)) * 64}
+    for name, data in contents.items():
+        fm.allocate(File(len(data), name))
+        disk.write(name, data)
+    disk.close()
+
+    disk = MappedDisk(path)
+    print(disk.file_registry)
+    view = disk.read("notes", 0, 24)
+    print(bytes(view))
+    view.release()
+    disk.close()
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+import argparse
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+
+from OS_Lab3 import Disk, File, FileManager
+
+
+class FileInode:
+    __slots__ = ('start_block', 'blocks_used')
+
+    def __init__(self, start_block: int, blocks_used: int):
+        self.start_block = start_block
+        self.blocks_used = blocks_used
+
+    # Code written against the flat registry reads file_info["start_block"].
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
+class DirInode:
+    __slots__ = ('children',)
+
+    def __init__(self):
+        self.children = {}  # Name -> FileInode or DirInode
+
+
+class DentryCache:
+    """Bounded LRU cache of path -> inode. A capacity of 0 disables it.
+
+    get() counts a hit or a miss; peek() is for extra probes within the same
+    lookup and counts neither.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        inode = self.entries.get(path)
+        if inode is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(path)
+        self.hits += 1
+        return inode
+
+    def peek(self, path):
+        inode = self.entries.get(path)
+        if inode is not None:
+            self.entries.move_to_end(path)
+        return inode
+
+    def put(self, path, inode):
+        if not self.capacity:
+            return
+        self.entries[path] = inode
+        self.entries.move_to_end(path)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def discard(self, path):
+        self.entries.pop(path, None)
+
+
+class Namespace:
+    """Directory tree of inodes with cached path lookups.
+
+    Paths are '/'-separated names from the root; a leading or trailing '/' is
+    ignored, and '.' and '..' have no special meaning. A lookup tries the
+    whole path in the dentry cache, then its parent directory, and otherwise
+    walks from the root. It caches only what it returns and, after a walk
+    from the root, the parent directory. Other files in the same directory
+    then walk a single component, and the cache is not filled with the upper
+    directories, which are cheap to walk. The cache pays off when lookups
+    keep returning to a working set of files and directories. With uniform
+    lookups over far more paths than it holds, it only adds the cost of the
+    probes.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.root = DirInode()
+        self.cache = DentryCache(cache_size)
+        self.file_count = 0
+        self.walked = 0  # Components looked up in directories rather than the cache
+
+    def lookup(self, path: str):
+        path = path.strip("/")
+        if not path:
+            return self.root
+        cache = self.cache
+        inode = self.root
+        start = 0
+        cut = path.rfind("/")
+        if cache.capacity:
+            cached = cache.get(path)
+            if cached is not None:
+                return cached
+            parent = cache.peek(path[:cut]) if cut >= 0 else None
+            if parent is not None:
+                inode, start = parent, cut + 1
+                cut = -1  # Already cached
+
+        while True:
+            end = path.find("/", start)
+            if end < 0:
+                end = len(path)
+            if type(inode) is not DirInode or (inode := inode.children.get(path[start:end])) is None:
+                raise KeyError(f"Path '{path}' not found.")
+            self.walked += 1
+            if end == len(path):
+                break
+            if end == cut:
+                cache.put(path[:cut], inode)
+            start = end + 1
+        cache.put(path, inode)
+        return inode
+
+    def _parent(self, path: str) -> tuple[DirInode, str, str]:
+        path = path.strip("/")
+        if not path or "" in path.split("/"):
+            raise ValueError(f"Invalid path '{path}'.")
+        cut = path.rfind("/")
+        parent = self.lookup(path[:cut]) if cut >= 0 else self.root
+        if type(parent) is not DirInode:
+            raise ValueError(f"'{path[:cut]}' is not a directory.")
+        return parent, path[cut + 1:], path
+
+    def _link(self, path: str, inode):
+        parent, name, path = self._parent(path)
+        if name in parent.children:
+            raise ValueError(f"'{path}' already exists.")
+        parent.children[name] = inode
+        self.cache.put(path, inode)
+
+    def create(self, path: str, inode: FileInode):
+        self._link(path, inode)
+        self.file_count += 1
+
+    def mkdir(self, path: str, parents: bool = False):
+        if parents:
+            directory = ""
+            for name in path.strip("/").split("/"):
+                directory = f"{directory}/{name}" if directory else name
+                try:
+                    if type(self.lookup(directory)) is not DirInode:
+                        raise ValueError(f"'{directory}' is not a directory.")
+                except KeyError:
+                    self._link(directory, DirInode())
+        else:
+            self._link(path, DirInode())
+
+    def unlink(self, path: str) -> FileInode:
+        """Removes a file and returns its inode."""
+        parent, name, path = self._parent(path)
+        inode = parent.children.get(name)
+        if type(inode) is not FileInode:
+            raise KeyError(f"File '{path}' not found.")
+        del parent.children[name]
+        self.cache.discard(path)
+        self.file_count -= 1
+        return inode
+
+    def rmdir(self, path: str, recursive: bool = False) -> list[FileInode]:
+        """Removes a directory, and with `recursive` everything below it. Returns the removed files."""
+        parent, name, path = self._parent(path)
+        directory = parent.children.get(name)
+        if type(directory) is not DirInode:
+            raise KeyError(f"Directory '{path}' not found.")
+        if directory.children and not recursive:
+            raise ValueError(f"Directory '{path}' is not empty.")
+        files = []
+        for entry_path, inode in self.walk(path):
+            self.cache.discard(entry_path)
+            if type(inode) is FileInode:
+                files.append(inode)
+        del parent.children[name]
+        self.cache.discard(path)
+        self.file_count -= len(files)
+        return files
+
+    def listdir(self, path: str = "") -> list[str]:
+        directory = self.lookup(path)
+        if type(directory) is not DirInode:
+            raise ValueError(f"'{path}' is not a directory.")
+        return list(directory.children)
+
+    def walk(self, path: str = "") -> Iterator[tuple[str, object]]:
+        """Yields (path, inode) for everything below `path`, depth first."""
+        stack = [(path.strip("/"), self.lookup(path))]
+        while stack:
+            base, directory = stack.pop()
+            for name, inode in directory.children.items():
+                child = f"{base}/{name}" if base else name
+                yield child, inode
+                if type(inode) is DirInode:
+                    stack.append((child, inode))
+
+
+class FileRegistry(Mapping):
+    """Read-only path -> FileInode view of a namespace, in place of Disk's flat dict."""
+
+    def __init__(self, namespace: Namespace):
+        self.namespace = namespace
+
+    def __getitem__(self, path):
+        inode = self.namespace.lookup(path)
+        if type(inode) is not FileInode:
+            raise KeyError(f"File '{path}' not found.")
+        return inode
+
+    def __iter__(self):
+        return (path for path, inode in self.namespace.walk() if type(inode) is FileInode)
+
+    def __len__(self):
+        return self.namespace.file_count
+
+
+class NamespaceDisk(Disk):
+    """Disk whose files live in a directory tree. File names are paths, and parent directories must exist."""
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512, cache_size: int = 4096):
+        super().__init__(total_size, block_size)
+        self.namespace = Namespace(cache_size)
+        self.file_registry = FileRegistry(self.namespace)
+
+    def add_file(self, file_name, start_block, blocks_used):
+        self.namespace.create(file_name, FileInode(start_block, blocks_used))
+        self.update_block_status(start_block, blocks_used, Disk.OCCUPIED)
+
+    def delete_file(self, file_name):
+        inode = self.namespace.unlink(file_name)
+        self.update_block_status(inode.start_block, inode.blocks_used, Disk.FREE)
+
+    def mkdir(self, path, parents=False):
+        self.namespace.mkdir(path, parents)
+
+    def delete_tree(self, path):
+        """Deletes a directory and everything below it, returning the number of files freed."""
+        files = self.namespace.rmdir(path, recursive=True)
+        for inode in files:
+            self.update_block_status(inode.start_block, inode.blocks_used, Disk.FREE)
+        return len(files)
+
+
+def build_tree(namespace: Namespace, files: int, depth: int, fanout: int) -> list[str]:
+    """Creates `fanout`**`depth` leaf directories and spreads `files` empty files over them."""
+    leaves = []
+    for leaf in range(fanout ** depth):
+        names = []
+        for _ in range(depth):
+            leaf, digit = divmod(leaf, fanout)
+            names.append(f"d{digit}")
+        leaves.append("/".join(names))
+        namespace.mkdir(leaves[-1], parents=True)
+    paths = [f"{leaves[i % len(leaves)]}/f{i}" for i in range(files)]
+    for path in paths:
+        namespace.create(path, FileInode(0, 0))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time path lookups in a deep namespace with and without the dentry cache.")
+    parser.add_argument("--files", type=int, default=10 ** 6)
+    parser.add_argument("--depth", type=int, default=8, help="directory levels above each file")
+    parser.add_argument("--fanout", type=int, default=4, help="subdirectories per directory")
+    parser.add_argument("--lookups", type=int, default=10 ** 6)
+    parser.add_argument("--cache-sizes", nargs="+", type=int, default=[0, 1 << 12, 1 << 17])
+    parser.add_argument("--hot-files", type=int, default=1000, help="files in the hot set of the skewed workload")
+    parser.add_argument("--hot-share", type=float, default=0.9, help="share of skewed lookups that go to the hot set")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    disk = NamespaceDisk(64 * block_size, block_size)
+    fm = FileManager(disk)
+    disk.mkdir("home/lab3", parents=True)
+    for name, size in (("home/lab3/notes.txt", 2048), ("home/lab3/data.bin", 8192), ("readme", 512)):
+        fm.allocate(File(size, name))
+    disk.move_file("readme", 40)
+    print(dict((path, (info["start_block"], info["blocks_used"])) for path, info in disk.file_registry.items()))
+    print(f"delete_tree('home') freed {disk.delete_tree('home')} files, {disk.free_blocks} blocks free")
+
+    namespace = Namespace()
+    start = time.perf_counter()
+    paths = build_tree(namespace, args.files, args.depth, args.fanout)
+    print(f"Built {args.files:,} files under {args.fanout ** args.depth:,} leaf directories "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    # Uniform lookups over every file, and lookups that mostly return to a small hot set.
+    rng = random.Random(args.seed)
+    hot = rng.sample(paths, min(args.hot_files, len(paths)))
+    workloads = {
+        "uniform": [rng.choice(paths) for _ in range(args.lookups)],
+        "hot set": [rng.choice(hot) if rng.random() < args.hot_share else rng.choice(paths)
+                    for _ in range(args.lookups)],
+    }
+    print("{:>10} {:>12} {:>14} {:>10} {:>18}".format(
+        "Workload", "Cache Size", "Lookups / s", "Hit Rate", "Walked / Lookup"))
+    for workload, lookups in workloads.items():
+        for cache_size in args.cache_sizes:
+            namespace.cache = DentryCache(cache_size)
+            namespace.walked = 0
+            start = time.perf_counter()
+            for path in lookups:
+                namespace.lookup(path)
+            elapsed = time.perf_counter() - start
+            cache = namespace.cache
+            probes = cache.hits + cache.misses
+            print("{:>10} {:>12,} {:>14,.0f} {:>10.1%} {:>18.2f}".format(
+                workload, cache_size, args.lookups / elapsed, cache.hits / probes if probes else 0.0,
+                namespace.walked / args.lookups))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import math
+import random
+from array import array
+
+from fragmentation import random_operations
+from OS_Lab3 import Disk, File, FileManager
+
+POINTER_SIZE = 4  # Bytes per block pointer on disk
+INODE_SIZE = 128  # Bytes per inode on disk
+DIRECT_POINTERS = 12
+
+
+class NonContiguousDisk(Disk):
+    """Disk that stores a file in any free blocks, lowest addresses first.
+
+    It keeps FileManager's contiguous interface: find_free_extent only checks
+    that enough blocks are free and returns the first free block, then
+    add_file gathers the blocks run by run from the free-extent index.
+    """
+
+    def metadata_blocks(self, blocks_used):
+        """Extra blocks a file of `blocks_used` data blocks needs for its metadata."""
+        return 0
+
+    def find_free_extent(self, blocks_needed):
+        needed = blocks_needed + self.metadata_blocks(blocks_needed)
+        if needed > self.free_blocks:
+            return None
+        return self.free_extents.first_fit(1) if needed else 0
+
+    def take_blocks(self, count) -> array:
+        blocks = array('i')
+        while len(blocks) < count:
+            start = self.free_extents.first_fit(1)
+            length = min(self.free_extents.runs[start], count - len(blocks))
+            self.update_block_status(start, length, Disk.OCCUPIED)
+            blocks.extend(range(start, start + length))
+        return blocks
+
+    def release_blocks(self, blocks):
+        """Frees the blocks, one update per run of consecutive block numbers."""
+        blocks = sorted(blocks)
+        i = 0
+        while i < len(blocks):
+            j = i + 1
+            while j < len(blocks) and blocks[j] == blocks[j - 1] + 1:
+                j += 1
+            self.update_block_status(blocks[i], j - i, Disk.FREE)
+            i = j
+
+
+class LinkedDisk(NonContiguousDisk):
+    """Linked allocation: each block's successor is kept in a file allocation table.
+
+    The FAT is a typed array with one 4-byte entry per block, END for the
+    last block of a file and UNUSED for a free block.
+    """
+
+    END = -1
+    UNUSED = -2
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512):
+        super().__init__(total_size, block_size)
+        self.fat = array('i', [LinkedDisk.UNUSED]) * self.total_blocks
+
+    def add_file(self, file_name, start_block, blocks_used):
+        if file_name in self.file_registry:
+            raise ValueError(f"File '{file_name}' already exists.")
+        blocks = self.take_blocks(blocks_used)
+        for block, successor in zip(blocks, blocks[1:]):
+            self.fat[block] = successor
+        if blocks:
+            self.fat[blocks[-1]] = LinkedDisk.END
+        self.file_registry[file_name] = {
+            "start_block": blocks[0] if blocks else start_block,
+            "blocks_used": blocks_used
+        }
+
+    def delete_file(self, file_name):
+        if file_name not in self.file_registry:
+            raise KeyError(f"File '{file_name}' not found.")
+        file_info = self.file_registry.pop(file_name)
+        blocks = list(self.chain(file_info))
+        for block in blocks:
+            self.fat[block] = LinkedDisk.UNUSED
+        self.release_blocks(blocks)
+
+    def chain(self, file_info):
+        block = file_info["start_block"]
+        for _ in range(file_info["blocks_used"]):
+            yield block
+            block = self.fat[block]
+
+    def block_at(self, file_name, offset):
+        """Returns the block holding the byte at `offset` and the FAT entries read to find it."""
+        file_info = self.file_registry[file_name]
+        index = offset // self.block_size
+        if not 0 <= index < file_info["blocks_used"]:
+            raise IndexError("Offset past the end of the file.")
+        block = file_info["start_block"]
+        for _ in range(index):
+            block = self.fat[block]
+        return block, index
+
+    def sequential_lookups(self, file_name):
+        """FAT entries read to walk the whole file once, keeping the position."""
+        return max(0, self.file_registry[file_name]["blocks_used"] - 1)
+
+    def metadata_bytes(self):
+        return POINTER_SIZE * self.total_blocks
+
+
+class Inode:
+    __slots__ = ('direct', 'indirect', 'double_indirect')
+
+    def __init__(self):
+        self.direct = array('i')
+        self.indirect = None  # Block number of the single indirect block
+        self.double_indirect = None  # Block number of the double indirect block
+
+
+class IndexedDisk(NonContiguousDisk):
+    """Indexed allocation: an inode with direct pointers and single and double indirect blocks.
+
+    Index blocks come from the same free pool as data blocks, and their
+    contents are kept in `index_blocks` as typed arrays of block numbers.
+    Any offset maps to its block with a fixed number of array lookups.
+    """
+
+    def __init__(self, total_size: int = 12288, block_size: int = 512):
+        super().__init__(total_size, block_size)
+        self.pointers_per_block = self.block_size // POINTER_SIZE
+        self.index_blocks = {}  # Index block number -> array of block numbers
+
+    def metadata_blocks(self, blocks_used):
+        per_block = self.pointers_per_block
+        rest = blocks_used - DIRECT_POINTERS
+        if rest <= 0:
+            return 0
+        if rest <= per_block:
+            return 1
+        rest -= per_block
+        if rest > per_block * per_block:
+            return math.inf  # Too big for a double indirect block
+        return 2 + math.ceil(rest / per_block)
+
+    def add_file(self, file_name, start_block, blocks_used):
+        if file_name in self.file_registry:
+            raise ValueError(f"File '{file_name}' already exists.")
+        per_block = self.pointers_per_block
+        index_count = self.metadata_blocks(blocks_used)
+        index = self.take_blocks(index_count)
+        blocks = self.take_blocks(blocks_used)
+
+        inode = Inode()
+        inode.direct = blocks[:DIRECT_POINTERS]
+        rest = blocks[DIRECT_POINTERS:]
+        if index_count:
+            inode.indirect = index[0]
+            self.index_blocks[index[0]] = rest[:per_block]
+            rest = rest[per_block:]
+        if index_count > 1:
+            inode.double_indirect = index[1]
+            children = index[2:]
+            self.index_blocks[index[1]] = children
+            for i, child in enumerate(children):
+                self.index_blocks[child] = rest[i * per_block:(i + 1) * per_block]
+
+        self.file_registry[file_name] = {
+            "start_block": blocks[0] if blocks else start_block,
+            "blocks_used": blocks_used,
+            "inode": inode,
+            "index_blocks": index_count
+        }
+
+    def delete_file(self, file_name):
+        if file_name not in self.file_registry:
+            raise KeyError(f"File '{file_name}' not found.")
+        file_info = self.file_registry.pop(file_name)
+        inode = file_info["inode"]
+        blocks = list(inode.direct)
+        for index_block in (inode.indirect, inode.double_indirect):
+            if index_block is None:
+                continue
+            blocks.append(index_block)
+            for pointer in self.index_blocks.pop(index_block):
+                blocks.append(pointer)
+                if index_block == inode.double_indirect:
+                    blocks.extend(self.index_blocks.pop(pointer))
+        self.release_blocks(blocks)
+
+    def block_at(self, file_name, offset):
+        """Returns the block holding the byte at `offset` and the metadata reads to find it.
+
+        Reads count the inode and every index block on the way, so they are
+        1 for a direct block, 2 through the single and 3 through the double
+        indirect block.
+        """
+        file_info = self.file_registry[file_name]
+        inode = file_info["inode"]
+        index = offset // self.block_size
+        if not 0 <= index < file_info["blocks_used"]:
+            raise IndexError("Offset past the end of the file.")
+        if index < DIRECT_POINTERS:
+            return inode.direct[index], 1
+        index -= DIRECT_POINTERS
+        per_block = self.pointers_per_block
+        if index < per_block:
+            return self.index_blocks[inode.indirect][index], 2
+        index -= per_block
+        child = self.index_blocks[inode.double_indirect][index // per_block]
+        return self.index_blocks[child][index % per_block], 3
+
+    def sequential_lookups(self, file_name):
+        """Metadata reads to walk the whole file once: the inode and each index block."""
+        return 1 + self.file_registry[file_name]["index_blocks"]
+
+    def metadata_bytes(self):
+        index_blocks = sum(info["index_blocks"] for info in self.file_registry.values())
+        return INODE_SIZE * len(self.file_registry) + index_blocks * self.block_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare contiguous, linked and indexed allocation.")
+    parser.add_argument("--blocks", type=int, default=20000, help="disk size in blocks")
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--max-size", type=int, default=512, help="largest file in blocks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    block_size = 512
+    operations = random_operations(args.operations, args.max_size * block_size, args.seed)
+    rng = random.Random(args.seed)
+    print("{:>12} {:>8} {:>14} {:>16} {:>16}".format(
+        "Mode", "Failed", "Metadata (B)", "Seq. Lookups", "Random Lookups"))
+    for mode, disk_class in (("contiguous", Disk), ("linked", LinkedDisk), ("indexed", IndexedDisk)):
+        disk = disk_class(args.blocks * block_size, block_size)
+        fm = FileManager(disk)
+        failed = 0
+        for opr in operations:
+            action, file_name, *size = opr.split("-")
+            if action == 'add':
+                failed += not fm.allocate(File(int(size[0]), file_name))
+            elif file_name in disk.file_registry:
+                disk.delete_file(file_name)
+
+        # Contiguous files need no metadata reads: the block is start_block + offset // block_size.
+        files = [file_name for file_name, info in disk.file_registry.items() if info["blocks_used"]]
+        sequential = random_reads = 0
+        metadata = 0
+        if disk_class is not Disk:
+            sequential = sum(disk.sequential_lookups(file_name) for file_name in files) / max(1, len(files))
+            for file_name in files:
+                offset = rng.randrange(disk.file_registry[file_name]["blocks_used"] * block_size)
+                random_reads += disk.block_at(file_name, offset)[1]
+            random_reads /= max(1, len(files))
+            metadata = disk.metadata_bytes()
+        print("{:>12} {:>8} {:>14} {:>16.1f} {:>16.1f}".format(
+            mode, failed, metadata, sequential, random_reads))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import csv
+import random
+import sys
+import time
+from collections.abc import Iterable, Iterator
+
+from allocation_policies import POLICIES
+from OS_Lab3 import Disk, File, FileManager
+
+CHUNK_SIZE = 1 << 20  # Bytes read from the log at a time
+
+OK = 'ok'
+FAILED = 'failed'  # Not enough contiguous space
+DUPLICATE = 'duplicate'  # Added a name that already exists
+MISSING = 'missing'  # Deleted a name that does not exist
+INVALID = 'invalid'  # Line could not be parsed
+OUTCOMES = (OK, FAILED, DUPLICATE, MISSING, INVALID)
+
+
+def read_lines(path: str) -> Iterator[bytes]:
+    """Yields the lines of a file, reading it in fixed-size chunks."""
+    with open(path, "rb") as file:
+        rest = b""
+        while chunk := file.read(CHUNK_SIZE):
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop()
+            yield from lines
+        if rest:
+            yield rest
+
+
+def parse(lines: Iterable[bytes]) -> Iterator[tuple]:
+    """Turns log lines into (line number, action, name, size) tuples.
+
+    Lines look like the ones main() in OS_Lab3 uses: 'add-<name>-<size>' and
+    'del-<name>'. The name may contain '-', since the size is split off the
+    right. Blank lines and lines starting with '#' are skipped, and a line
+    that does not parse comes out with the action INVALID.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith(b"#"):
+            continue
+        action, _, rest = line.partition(b"-")
+        try:
+            if action == b"add":
+                name, _, size = rest.rpartition(b"-")
+                size = int(size)
+                if not name or size < 0:
+                    raise ValueError
+                yield line_number, 'add', name.decode(), size
+            elif action == b"del" and rest:
+                yield line_number, 'del', rest.decode(), None
+            else:
+                raise ValueError
+        except (ValueError, UnicodeDecodeError):
+            yield line_number, INVALID, line.decode(errors="replace"), None
+
+
+def replay(operations: Iterable[tuple], fm: FileManager) -> Iterator[tuple]:
+    """Applies parsed operations and yields (line number, action, name, outcome)."""
+    disk = fm.disk
+    for line_number, action, name, size in operations:
+        if action == 'add':
+            if name in disk.file_registry:
+                outcome = DUPLICATE
+            else:
+                outcome = OK if fm.allocate(File(size, name)) else FAILED
+        elif action == 'del':
+            # The disk is called directly because FileManager.delete prints missing files.
+            if name in disk.file_registry:
+                disk.delete_file(name)
+                outcome = OK
+            else:
+                outcome = MISSING
+        else:
+            outcome = INVALID
+        yield line_number, action, name, outcome
+
+
+class ReplaySummary:
+    """Running outcome counts and disk state, printed every `every` operations."""
+
+    def __init__(self, disk: Disk, every: int = 1000000):
+        self.disk = disk
+        self.every = every
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+        self.operations = 0
+        self.start = time.perf_counter()
+
+    def track(self, outcomes: Iterable[tuple]) -> Iterator[tuple]:
+        for outcome in outcomes:
+            self.counts[outcome[3]] += 1
+            self.operations += 1
+            if self.operations % self.every == 0:
+                self.show()
+            yield outcome
+
+    def show(self):
+        elapsed = time.perf_counter() - self.start
+        disk = self.disk
+        largest = disk.free_extents.largest()
+        fragmentation = 1 - largest / disk.free_blocks if disk.free_blocks else 0.0
+        counts = " ".join(f"{outcome}={count}" for outcome, count in self.counts.items())
+        print(f"{self.operations:>12,} ops {self.operations / elapsed if elapsed else 0:>10,.0f} ops/s | {counts} | "
+              f"files={len(disk.file_registry)} free={disk.free_blocks} holes={len(disk.free_extents)} "
+              f"ext. frag.={fragmentation:.1%}", flush=True)
+
+
+def generate_log(path: str, count: int, max_size: int, seed: int = 0, delete_share: float = 0.5):
+    """Writes a random log of `count` operations without holding it in memory."""
+    rng = random.Random(seed)
+    live = []
+    with open(path, "w") as file:
+        for i in range(count):
+            if live and rng.random() < delete_share:
+                j = rng.randrange(len(live))
+                live[j], live[-1] = live[-1], live[j]
+                file.write(f"del-{live.pop()}\n")
+            else:
+                file.write(f"add-f{i}-{rng.randint(1, max_size)}\n")
+                live.append(f"f{i}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an allocator operation log against the disk.")
+    parser.add_argument("log", help="file with one 'add-<name>-<size>' or 'del-<name>' per line")
+    parser.add_argument("--blocks", type=int, default=1 << 20, help="disk size in blocks")
+    parser.add_argument("--block-size", type=int, default=512)
+    parser.add_argument("--policy", choices=POLICIES, default="first")
+    parser.add_argument("--every", type=int, default=1000000, help="operations between summaries")
+    parser.add_argument("--outcomes", help="write 'line,action,name,outcome' for every operation to this file")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="first write a random log of COUNT operations")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_log(args.log, args.generate, 256 * args.block_size)
+
+    disk = Disk(args.blocks * args.block_size, args.block_size)
+    fm = FileManager(disk, POLICIES[args.policy]())
+    summary = ReplaySummary(disk, args.every)
+    outcomes = summary.track(replay(parse(read_lines(args.log)), fm))
+    if args.outcomes:
+        with open(args.outcomes, "w", newline="") as file:
+            csv.writer(file).writerows(outcomes)
+    else:
+        for _ in outcomes:
+            pass
+    if summary.operations % summary.every:
+        summary.show()
+    if summary.counts[INVALID]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
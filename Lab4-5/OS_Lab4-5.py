@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from free_holes import FreeHoleIndex
+
 
 class Process:
     def __init__(self, process_id: str, process_size: int):
@@ -16,20 +18,24 @@ class Memory:
             cls._instance.init_blocks()
         return cls._instance
 
-    def init_blocks(self):
-        self.PARTITIONS = [15, 25, 20, 35, 30, 10, 50]
+    def init_blocks(self, partitions: list[int] = None):
+        self.PARTITIONS = partitions or [15, 25, 20, 35, 30, 10, 50]
         self.block_registry = {f'B{i}': {'Block Size': size, 'Status': 0, 'Process ID': None, 'Process Size': None}
                                for i, size in enumerate(self.PARTITIONS)}
+        self.block_ids = list(self.block_registry)
+        self.free_holes = FreeHoleIndex(self.PARTITIONS)
 
     def allocate(self, block_id: str, process: Process):
         block = self.block_registry[block_id]
         block.update({'Status': 1, 'Process ID': process.id,
                      'Process Size': process.size})
+        self.free_holes.take(int(block_id[1:]))
 
     def clear(self):
         for block in self.block_registry.values():
             block.update(
                 {'Status': 0, 'Process ID': None, 'Process Size': None})
+        self.free_holes = FreeHoleIndex(self.PARTITIONS)
 
     def show(self):
         header = f"{'Block ID':<10} | {'Size':<5} | {'Status':<10} | {'Process ID':<10} | {'Process Size':<12} | {'Internal Frag.':<14}"
@@ -54,24 +60,18 @@ class BestFit(AllocationStrategy):
     def process(self, processes: list[Process]):
         memory = Memory()
         for process in processes:
-            best_fit_block_id, best_fit_size_diff = None, float('inf')
-            for block_id, block in memory.block_registry.items():
-                if block['Status'] == 0 and block['Block Size'] >= process.size:
-                    size_diff = block['Block Size'] - process.size
-                    if size_diff < best_fit_size_diff:
-                        best_fit_block_id, best_fit_size_diff = block_id, size_diff
-            if best_fit_block_id:
-                memory.allocate(best_fit_block_id, process)
+            best_fit_block = memory.free_holes.best_fit(process.size)
+            if best_fit_block is not None:
+                memory.allocate(memory.block_ids[best_fit_block], process)
 
 
 class FirstFit(AllocationStrategy):
     def process(self, processes: list[Process]):
         memory = Memory()
         for process in processes:
-            for block_id, block in memory.block_registry.items():
-                if block['Status'] == 0 and block['Block Size'] >= process.size:
-                    memory.allocate(block_id, process)
-                    break
+            first_fit_block = memory.free_holes.first_fit(process.size)
+            if first_fit_block is not None:
+                memory.allocate(memory.block_ids[first_fit_block], process)
 
 
 def main():
@@ -1,3 +1,6 @@
+from free_holes import FreeHoleIndex
+
+
 class Process:
     def __init__(self, process_id: str, process_size: int):
         self.id = process_id
@@ -8,14 +11,16 @@ class Memory:
     FREE = 'Free'
     OCCUPIED = 'Occupied'
 
-    def __init__(self):
-        self.PARTITIONS = [15, 25, 20, 35, 30, 10, 50]
+    def __init__(self, partitions: list[int] = None):
+        self.PARTITIONS = partitions or [15, 25, 20, 35, 30, 10, 50]
         self.block_registry = {f'B{i}': {
             'Block Size': size,
             'Status': Memory.FREE,
             'Process ID': None,
             'Process Size': None}
             for i, size in enumerate(self.PARTITIONS)}
+        self.block_ids = list(self.block_registry)
+        self.free_holes = FreeHoleIndex(self.PARTITIONS)
 
     def allocate(self, block_id: str, process: Process):
         block = self.block_registry[block_id]
@@ -23,15 +28,15 @@ class Memory:
             'Status': Memory.OCCUPIED,
             'Process ID': process.id,
             'Process Size': process.size})
+        self.free_holes.take(int(block_id[1:]))
 
 
 class FirstFit():
     def process(self, memory, processes: list[Process]):
         for process in processes:
-            for block_id, block in memory.block_registry.items():
-                if block['Status'] == Memory.FREE and block['Block Size'] >= process.size:
-                    memory.allocate(block_id, process)
-                    break
+            first_fit_block = memory.free_holes.first_fit(process.size)
+            if first_fit_block is not None:
+                memory.allocate(memory.block_ids[first_fit_block], process)
 
 
 def show(memory):
@@ -0,0 +1,241 @@
+import argparse
+import random
+import time
+from array import array
+
+from free_holes import SortedList
+from OS_Lab4 import Process
+
+FIRST, BEST, NEXT, WORST = 'first', 'best', 'next', 'worst'
+STRATEGIES = (FIRST, BEST, NEXT, WORST)
+
+
+class DynamicMemory:
+    """Variable partitions carved out of one contiguous memory of `total_size` units.
+
+    A process gets exactly its size, split off the front of the hole the
+    strategy picks, and a freed partition merges at once with the holes on
+    either side. Holes are indexed three ways. Two dicts map hole starts to
+    sizes and hole ends to starts, for coalescing. A max segment tree over
+    addresses holds each hole's size at its start, for first fit and next
+    fit. A SortedList of (size, start) serves best fit and worst fit. Every
+    operation is O(log n). Ties go to the lowest address. Next fit resumes
+    from the start of the hole where the last allocation ended, so a hole
+    that has since grown back over the rover is seen whole.
+    """
+
+    def __init__(self, total_size: int = 185):
+        self.total_size = total_size
+        self.holes = {}  # Start -> size
+        self.hole_ends = {}  # End (exclusive) -> start
+        self.by_size = SortedList()  # (size, start)
+        self.size = 1
+        while self.size < max(1, total_size):
+            self.size *= 2
+        self.tree = array('q', bytes(16 * self.size))
+        self.partitions = {}  # Process ID -> (start, size)
+        self.free_size = 0
+        self.rover = 0  # Where next fit resumes
+        self.requests = 0
+        self.failures = 0
+        self._add_hole(0, total_size)
+
+    def _set(self, start, size):
+        tree = self.tree
+        node = self.size + start
+        tree[node] = size
+        while node > 1:
+            node //= 2
+            value = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == value:
+                break
+            tree[node] = value
+
+    def _add_hole(self, start, size):
+        if not size:
+            return
+        self.holes[start] = size
+        self.hole_ends[start + size] = start
+        self.by_size.add((size, start))
+        self._set(start, size)
+        self.free_size += size
+
+    def _remove_hole(self, start):
+        size = self.holes.pop(start)
+        del self.hole_ends[start + size]
+        self.by_size.remove((size, start))
+        self._set(start, 0)
+        self.free_size -= size
+        return size
+
+    def _leftmost(self, lowest, size):
+        """Lowest hole start at or after `lowest` with at least `size` units, or None."""
+        tree = self.tree
+        node = self.size + lowest
+        if tree[node] < size:
+            # Climb until a right sibling, which covers addresses further on, has a large enough hole.
+            while node > 1 and (node % 2 or tree[node + 1] < size):
+                node //= 2
+            if node == 1:
+                return None
+            node += 1
+            while node < self.size:
+                node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        return node - self.size
+
+    def _hole_containing(self, address):
+        """Start of the hole that contains `address`, or None if it is allocated."""
+        tree = self.tree
+        node = self.size + address
+        if tree[node]:
+            return address
+        # Walk up to the nearest subtree on the left holding a hole, then down to its last hole.
+        while node > 1:
+            if node % 2 and tree[node - 1]:
+                node -= 1
+                while node < self.size:
+                    node = 2 * node + 1 if tree[2 * node + 1] else 2 * node
+                start = node - self.size
+                return start if start + self.holes[start] > address else None
+            node //= 2
+        return None
+
+    def find(self, size, strategy=FIRST):
+        """Start of the hole the strategy would split for `size` units, or None."""
+        if size <= 0:
+            raise ValueError(f"Size must be positive, got {size}.")
+        if self.tree[1] < size:
+            return None
+        if strategy == FIRST:
+            return self._leftmost(0, size)
+        if strategy == BEST:
+            return self.by_size.ceiling((size, -1))[1]
+        if strategy == WORST:
+            return self.by_size.ceiling((self.by_size.last()[0], -1))[1]
+        if strategy == NEXT:
+            rover = self.rover if self.rover < self.total_size else 0
+            # Resume from the start of the hole the rover is in, if it has been freed since.
+            hole = self._hole_containing(rover)
+            if hole is not None:
+                rover = hole
+            start = self._leftmost(rover, size)
+            return start if start is not None or not rover else self._leftmost(0, size)
+        raise ValueError(f"Unknown strategy '{strategy}'.")
+
+    def allocate(self, process: Process, strategy=FIRST):
+        """Gives the process a partition and returns its start, or None if no hole is large enough."""
+        if process.id in self.partitions:
+            raise ValueError(f"Process '{process.id}' already has a partition.")
+        if process.size <= 0:
+            raise ValueError(f"Process '{process.id}' needs a positive size, got {process.size}.")
+        self.requests += 1
+        start = self.find(process.size, strategy)
+        if start is None:
+            self.failures += 1
+            return None
+        hole = self._remove_hole(start)
+        self._add_hole(start + process.size, hole - process.size)
+        self.partitions[process.id] = (start, process.size)
+        self.rover = start + process.size
+        return start
+
+    def free(self, process_id: str):
+        if process_id not in self.partitions:
+            raise KeyError(f"Process '{process_id}' has no partition.")
+        start, size = self.partitions.pop(process_id)
+        end = start + size
+        if end in self.holes:
+            size += self._remove_hole(end)
+        if start in self.hole_ends:
+            before = self.hole_ends[start]
+            size += self._remove_hole(before)
+            start = before
+        self._add_hole(start, size)
+
+    def largest_hole(self):
+        return self.tree[1]
+
+    def external_fragmentation(self):
+        """Share of the free memory outside the largest hole."""
+        return 1 - self.largest_hole() / self.free_size if self.free_size else 0.0
+
+    def failure_rate(self):
+        return self.failures / self.requests if self.requests else 0.0
+
+    def show(self):
+        FORMAT = "{:<10} | {:<5} | {:<10} | {:<10}"
+        header = FORMAT.format('Start', 'Size', 'Status', 'Process ID')
+        print(header)
+        print('-' * len(header))
+
+        rows = [(start, size, 'Free', 'None') for start, size in self.holes.items()]
+        rows += [(start, size, 'Occupied', pid) for pid, (start, size) in self.partitions.items()]
+        for row in sorted(rows):
+            print(FORMAT.format(*row))
+        print(f"External Frag.: {self.external_fragmentation():.1%}, "
+              f"failed {self.failures} of {self.requests} requests")
+
+
+def request_stream(count: int, draw_size, target: float, seed: int = 0) -> list:
+    """Random arrivals (Process objects) and departures (their IDs).
+
+    Processes arrive more often than they leave, but one leaves whenever
+    `target` are live, so the stream settles at about `target` live
+    processes. `draw_size(rng)` picks each process size.
+    """
+    rng = random.Random(seed)
+    stream = []
+    live = []
+    for i in range(count):
+        if live and (len(live) >= target or rng.random() < 0.4):
+            j = rng.randrange(len(live))
+            live[j], live[-1] = live[-1], live[j]
+            stream.append(live.pop())
+        else:
+            stream.append(Process(f"P{i}", draw_size(rng)))
+            live.append(f"P{i}")
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dynamic partitioning strategies on a random request stream.")
+    parser.add_argument("--memory", type=int, default=1 << 20, help="memory size in units")
+    parser.add_argument("--operations", type=int, default=200000)
+    parser.add_argument("--max-size", type=int, default=2000, help="largest process size")
+    parser.add_argument("--load", type=float, default=0.9, help="share of memory the live processes ask for on average")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    processes = [
+        Process("P1", 10), Process("P2", 20), Process("P3", 30),
+        Process("P4", 15), Process("P5", 5)
+    ]
+    memory = DynamicMemory(sum([15, 25, 20, 35, 30, 10, 50]))
+    for process in processes:
+        memory.allocate(process)
+    memory.free("P2")
+    memory.free("P4")
+    memory.allocate(Process("P6", 25), BEST)
+    memory.show()
+    print()
+
+    target = args.load * args.memory / ((1 + args.max_size) / 2)
+    stream = request_stream(args.operations, lambda rng: rng.randint(1, args.max_size), target, args.seed)
+
+    print("{:>10} {:>14} {:>12} {:>12} {:>10}".format("Strategy", "Failure Rate", "Ext. Frag.", "Largest", "us / op"))
+    for strategy in STRATEGIES:
+        memory = DynamicMemory(args.memory)
+        start = time.perf_counter()
+        for operation in stream:
+            if type(operation) is Process:
+                memory.allocate(operation, strategy)
+            elif operation in memory.partitions:
+                memory.free(operation)
+        elapsed = time.perf_counter() - start
+        print("{:>10} {:>14.2%} {:>12.1%} {:>12,} {:>10.2f}".format(
+            strategy, memory.failure_rate(), memory.external_fragmentation(), memory.largest_hole(),
+            elapsed / len(stream) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import bisect
+from array import array
+
+
+class SortedList:
+    """Sorted list kept as short sorted sublists, so an insert or removal only shifts a few hundred items."""
+
+    LOAD = 512
+
+    def __init__(self):
+        self.lists = []
+        self.maxes = []  # Last item of each sublist
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for sublist in self.lists:
+            yield from sublist
+
+    def add(self, item):
+        self.size += 1
+        if not self.lists:
+            self.lists.append([item])
+            self.maxes.append(item)
+            return
+        i = min(bisect.bisect_left(self.maxes, item), len(self.maxes) - 1)
+        sublist = self.lists[i]
+        bisect.insort(sublist, item)
+        self.maxes[i] = sublist[-1]
+        if len(sublist) > 2 * self.LOAD:
+            self.lists[i:i + 1] = [sublist[:self.LOAD], sublist[self.LOAD:]]
+            self.maxes[i:i + 1] = [sublist[self.LOAD - 1], sublist[-1]]
+
+    def remove(self, item):
+        i = bisect.bisect_left(self.maxes, item)
+        sublist = self.lists[i]
+        del sublist[bisect.bisect_left(sublist, item)]
+        self.size -= 1
+        if sublist:
+            self.maxes[i] = sublist[-1]
+        else:
+            del self.lists[i]
+            del self.maxes[i]
+
+    def ceiling(self, item):
+        """Smallest item not below `item`, or None."""
+        i = bisect.bisect_left(self.maxes, item)
+        if i == len(self.maxes):
+            return None
+        sublist = self.lists[i]
+        return sublist[bisect.bisect_left(sublist, item)]
+
+    def last(self):
+        return self.maxes[-1] if self.maxes else None
+
+
+TAKEN = -1  # Segment tree value of an occupied partition, below any process size
+
+
+class FreeHoleIndex:
+    """Index of the free partitions of a fixed partition table, numbered in table order.
+
+    Best fit bisects the partitions sorted by (size, number), then skips
+    taken ones with union-find "next free" pointers, so it returns the
+    smallest adequate block, lowest-numbered on ties. First fit descends a
+    max segment tree over the sizes of the free partitions. Both match a
+    scan of the table in order, in O(log n).
+    """
+
+    def __init__(self, sizes: list[int]):
+        self.count = len(sizes)
+        self.by_size = sorted(range(self.count), key=sizes.__getitem__)  # Stable, so ties keep table order
+        self.sorted_sizes = [sizes[number] for number in self.by_size]
+        self.rank = array('q', bytes(8 * self.count))
+        for rank, number in enumerate(self.by_size):
+            self.rank[number] = rank
+        self.next_free = array('q', range(self.count + 1))  # Rank `count` is a sentinel
+
+        self.size = 1
+        while self.size < max(1, self.count):
+            self.size *= 2
+        self.tree = array('q', [TAKEN]) * (2 * self.size)
+        self.tree[self.size:self.size + self.count] = array('q', sizes)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def _find(self, rank):
+        next_free = self.next_free
+        while next_free[rank] != rank:
+            next_free[rank] = next_free[next_free[rank]]
+            rank = next_free[rank]
+        return rank
+
+    def best_fit(self, size):
+        rank = self._find(bisect.bisect_left(self.sorted_sizes, size))
+        return None if rank == self.count else self.by_size[rank]
+
+    def first_fit(self, size):
+        tree = self.tree
+        if tree[1] < size:
+            return None
+        node = 1
+        while node < self.size:
+            node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        return node - self.size
+
+    def largest(self):
+        return max(self.tree[1], 0)
+
+    def take(self, number):
+        """Marks partition `number` occupied. Taking it again has no effect."""
+        rank = self.rank[number]
+        self.next_free[rank] = rank + 1
+        tree = self.tree
+        node = self.size + number
+        tree[node] = TAKEN
+        while node > 1:
+            node //= 2
+            value = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == value:
+                break
+            tree[node] = value
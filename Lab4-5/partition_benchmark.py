@@ -0,0 +1,82 @@
+import argparse
+import random
+import time
+
+import OS_Lab4
+import OS_Lab5
+
+
+def scan_best_fit(memory, processes):
+    """BestFit.process as it was before the free-hole index: a scan of the whole table per process."""
+    for process in processes:
+        best_fit_block_id, best_fit_size_diff = None, float('inf')
+        for block_id, block in memory.block_registry.items():
+            if block['Status'] == memory.FREE and block['Block Size'] >= process.size:
+                size_diff = block['Block Size'] - process.size
+                if size_diff < best_fit_size_diff:
+                    best_fit_block_id, best_fit_size_diff = block_id, size_diff
+        if best_fit_block_id:
+            memory.allocate(best_fit_block_id, process)
+
+
+def scan_first_fit(memory, processes):
+    """FirstFit.process as it was before the free-hole index."""
+    for process in processes:
+        for block_id, block in memory.block_registry.items():
+            if block['Status'] == memory.FREE and block['Block Size'] >= process.size:
+                memory.allocate(block_id, process)
+                break
+
+
+def placements(memory):
+    return [block['Process ID'] for block in memory.block_registry.values()]
+
+
+def timed(strategy, memory, processes):
+    start = time.perf_counter()
+    strategy(memory, processes)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the indexed fit search with the table scan it replaced.")
+    parser.add_argument("--partitions", type=int, default=10 ** 6)
+    parser.add_argument("--processes", type=int, default=10 ** 5, help="processes for the indexed search")
+    parser.add_argument("--scan-processes", type=int, default=50, help="processes for the scan, which is far slower")
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sizes = [rng.randint(1, args.max_size) for _ in range(args.partitions)]
+    processes = [OS_Lab4.Process(f"P{i}", rng.randint(1, args.max_size)) for i in range(args.processes)]
+    head = processes[:args.scan_processes]
+    extra = [OS_Lab4.Process(f"X{i}", rng.randint(1, args.max_size)) for i in range(args.scan_processes)]
+
+    print(f"{args.partitions:,} partitions, {args.processes:,} processes for the index, "
+          f"{args.scan_processes:,} for each scan")
+    print("{:>10} {:>22} {:>14} {:>10}".format("Strategy", "Search", "us / process", "Speedup"))
+    for name, module, indexed, scan in (("best-fit", OS_Lab4, lambda m, p: OS_Lab4.BestFit().process(m, p),
+                                         scan_best_fit),
+                                        ("first-fit", OS_Lab5, lambda m, p: OS_Lab5.FirstFit().process(m, p),
+                                         scan_first_fit)):
+        scanned, checked = module.Memory(sizes), module.Memory(sizes)
+        empty_scan = timed(scan, scanned, head) / len(head)
+        indexed(checked, head)
+        if placements(scanned) != placements(checked):
+            raise AssertionError(f"{name}: indexed placements differ from the scan.")
+
+        memory = module.Memory(sizes)
+        indexed_time = timed(indexed, memory, processes) / len(processes)
+        placed = sum(block['Status'] == module.Memory.OCCUPIED for block in memory.block_registry.values())
+        # The scan again, once the batch has filled the front of the table.
+        loaded_scan = timed(scan, memory, extra) / len(extra)
+        print("{:>10} {:>22} {:>14.2f} {:>10}".format(name, "scan, empty table", empty_scan * 1e6, ""))
+        print("{:>10} {:>22} {:>14.2f} {:>10}".format(name, "scan, after batch", loaded_scan * 1e6, ""))
+        print("{:>10} {:>22} {:>14.2f} {:>9,.0f}x".format(
+            name, "indexed", indexed_time * 1e6, loaded_scan / indexed_time))
+        print(f"{'':>10} first {len(head):,} placements match the scan; {placed:,} of {len(processes):,} placed")
+
+
+if __name__ == '__main__':
+    main()
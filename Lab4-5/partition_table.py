@@ -0,0 +1,189 @@
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from OS_Lab4 import Memory, Process
+
+FIRST, BEST, WORST = 'first', 'best', 'worst'
+
+
+class PartitionTable:
+    """Fixed partitions kept as NumPy columns instead of one dict per block.
+
+    Searches run in two vectorised steps over about sqrt(n) entries each: a
+    mask and argmax/argmin over a per-chunk summary picks the chunk, then
+    another over that chunk picks the block. First fit and worst fit use the
+    largest free size in each chunk of the table. Best fit uses the blocks
+    sorted by (size, number) and the free count in each chunk of that order,
+    since the smallest adequate block is the first free one from the bisect
+    point. All three break ties by table order, like a scan of block_registry.
+    """
+
+    def __init__(self, partitions):
+        self.block_size = np.asarray(partitions, dtype=np.int64)
+        self.count = len(self.block_size)
+        self.occupied = np.zeros(self.count, dtype=bool)
+        self.process_size = np.zeros(self.count, dtype=np.int64)
+        self.process_index = np.full(self.count, -1, dtype=np.int64)  # Into process_ids
+        self.process_ids = []
+
+        self.chunk = max(64, math.isqrt(self.count))
+        chunks = -(-self.count // self.chunk)
+        padding = chunks * self.chunk - self.count
+        # Size of each block while free, -1 once occupied or past the end of the table.
+        self.free_size = np.concatenate([self.block_size, np.full(padding, -1, dtype=np.int64)])
+        self.free_chunks = self.free_size.reshape(chunks, self.chunk)
+        self.chunk_max = self.free_chunks.max(axis=1)
+
+        self.by_size = np.argsort(self.block_size, kind='stable')
+        self.sorted_size = self.block_size[self.by_size]
+        self.rank = np.empty(self.count, dtype=np.int64)
+        self.rank[self.by_size] = np.arange(self.count)
+        self.free_by_rank = np.concatenate([np.ones(self.count, dtype=bool), np.zeros(padding, dtype=bool)])
+        self.free_rank_chunks = self.free_by_rank.reshape(chunks, self.chunk)
+        self.chunk_free = self.free_rank_chunks.sum(axis=1)
+
+    def first_fit(self, size):
+        chunk = int(np.argmax(self.chunk_max >= size))
+        if self.chunk_max[chunk] < size:
+            return None
+        return chunk * self.chunk + int(np.argmax(self.free_chunks[chunk] >= size))
+
+    def worst_fit(self, size):
+        chunk = int(np.argmax(self.chunk_max))
+        if self.chunk_max[chunk] < size:
+            return None
+        return chunk * self.chunk + int(np.argmax(self.free_chunks[chunk]))
+
+    def best_fit(self, size):
+        chunk, offset = divmod(int(np.searchsorted(self.sorted_size, size)), self.chunk)
+        if chunk >= len(self.chunk_free):
+            return None
+        rest = self.free_rank_chunks[chunk, offset:]
+        i = int(np.argmax(rest))
+        if not rest[i]:
+            later = self.chunk_free[chunk + 1:] > 0
+            i = int(np.argmax(later)) if len(later) else 0
+            if not len(later) or not later[i]:
+                return None
+            chunk, offset = chunk + 1 + i, 0
+            i = int(np.argmax(self.free_rank_chunks[chunk]))
+        return int(self.by_size[chunk * self.chunk + offset + i])
+
+    def find(self, size, strategy=FIRST):
+        if strategy == FIRST:
+            return self.first_fit(size)
+        if strategy == BEST:
+            return self.best_fit(size)
+        if strategy == WORST:
+            return self.worst_fit(size)
+        raise ValueError(f"Unknown strategy '{strategy}'.")
+
+    def allocate(self, block, process: Process):
+        if self.occupied[block]:
+            raise ValueError(f"Block B{block} is already occupied.")
+        self.occupied[block] = True
+        self.process_size[block] = process.size
+        self.process_index[block] = len(self.process_ids)
+        self.process_ids.append(process.id)
+
+        chunk = block // self.chunk
+        self.free_size[block] = -1
+        self.chunk_max[chunk] = self.free_chunks[chunk].max()
+        rank = self.rank[block]
+        self.free_by_rank[rank] = False
+        self.chunk_free[rank // self.chunk] -= 1
+
+    def process(self, processes: list[Process], strategy=FIRST) -> int:
+        """Places processes one after another and returns how many found a block."""
+        placed = 0
+        for process in processes:
+            block = self.find(process.size, strategy)
+            if block is not None:
+                self.allocate(block, process)
+                placed += 1
+        return placed
+
+    def clear(self):
+        self.__init__(self.block_size)
+
+    def internal_fragmentation(self) -> np.ndarray:
+        return np.where(self.occupied, self.block_size - self.process_size, 0)
+
+    def summary(self) -> dict:
+        occupied = int(self.occupied.sum())
+        return {
+            "Occupied": occupied,
+            "Free": self.count - occupied,
+            "Process Size": int(self.process_size.sum()),
+            "Internal Frag.": int(self.internal_fragmentation().sum()),
+            "Free Size": int(self.block_size[~self.occupied].sum()),
+        }
+
+    def show(self, limit: int = None):
+        FORMAT = "{:<10} | {:<5} | {:<10} | {:<10} | {:<12} | {:<14}"
+        header = FORMAT.format('Block ID', 'Size', 'Status',
+                               'Process ID', 'Process Size', 'Internal Frag.')
+        print(header)
+        print('-' * len(header))
+
+        rows = slice(0, self.count if limit is None else limit)
+        columns = zip(self.block_size[rows].tolist(), self.occupied[rows].tolist(),
+                      self.process_index[rows].tolist(), self.process_size[rows].tolist(),
+                      self.internal_fragmentation()[rows].tolist())
+        for bid, (bsize, occupied, index, psize, internal_frag) in enumerate(columns):
+            status = Memory.OCCUPIED if occupied else Memory.FREE
+            pid = self.process_ids[index] if occupied else 'None'
+            print(FORMAT.format(f'B{bid}', bsize, status, pid, psize if occupied else 'None', internal_frag))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocate a batch of processes against a large columnar partition table.")
+    parser.add_argument("--partitions", type=int, default=10 ** 6)
+    parser.add_argument("--processes", type=int, default=10 ** 5)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    processes = [
+        Process("P1", 10), Process("P2", 20), Process("P3", 30),
+        Process("P4", 15), Process("P5", 5)
+    ]
+    for name, strategy in (("Best Fit", BEST), ("First Fit", FIRST), ("Worst Fit", WORST)):
+        table = PartitionTable(Memory().PARTITIONS)
+        print(f"{name}:")
+        table.process(processes, strategy)
+        table.show()
+        print()
+
+    rng = random.Random(args.seed)
+    sizes = [rng.randint(1, args.max_size) for _ in range(args.partitions)]
+    processes = [Process(f"P{i}", rng.randint(1, args.max_size)) for i in range(args.processes)]
+    tracemalloc.start()
+    table = PartitionTable(sizes)
+    columnar = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    memory = Memory(sizes)
+    registry = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del memory
+    print(f"{args.partitions:,} partitions: {columnar / 2 ** 20:.0f} MiB as columns and indexes, "
+          f"{registry / 2 ** 20:.0f} MiB as OS_Lab4.Memory")
+
+    print("{:>10} {:>12} {:>10} {:>14} {:>10}".format("Strategy", "Placed", "Seconds", "Internal Frag.", "us / proc"))
+    for strategy in (FIRST, BEST, WORST):
+        table.clear()
+        start = time.perf_counter()
+        placed = table.process(processes, strategy)
+        elapsed = time.perf_counter() - start
+        print("{:>10} {:>12,} {:>10.2f} {:>14,} {:>10.2f}".format(
+            strategy, placed, elapsed, table.summary()["Internal Frag."], elapsed / len(processes) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import bisect
+import time
+
+from dynamic_partitions import BEST, FIRST, DynamicMemory, request_stream
+from OS_Lab4 import Process
+
+SIZE_CLASSES = (8, 16, 32, 48, 64, 96, 128, 192, 256, 384, 512)
+SLAB_PREFIX = "slab:"  # Slabs take partitions named with this prefix, so object ids may not use it
+
+
+class Slab:
+    __slots__ = ('id', 'size_class', 'start', 'free_slots', 'in_use', 'partial_index')
+
+    def __init__(self, slab_id: str, size_class: int, start: int, slots: int):
+        self.id = slab_id
+        self.size_class = size_class
+        self.start = start
+        self.free_slots = list(range(slots - 1, -1, -1))  # Stack, lowest slot on top
+        self.in_use = 0
+        self.partial_index = None  # Position in its class's partial list while it has free slots
+
+
+class SlabAllocator:
+    """Segregated-fit allocator for small objects on top of a DynamicMemory.
+
+    Each request is rounded up to a size class. Every class keeps a list of
+    partial slabs, which still have free slots, and each slab keeps a stack
+    of its free slots, so allocate and free are O(1). A new slab of
+    `slab_size` units is taken from the memory only when the class has no
+    partial slab, and a slab goes back to the memory as soon as its last
+    object is freed. Requests above the largest class go to the memory
+    directly, with `large_strategy`.
+    """
+
+    def __init__(self, memory: DynamicMemory, slab_size: int = 4096, size_classes=SIZE_CLASSES,
+                 large_strategy=FIRST):
+        self.memory = memory
+        self.slab_size = slab_size
+        self.size_classes = sorted(size_classes)
+        if slab_size < self.size_classes[-1]:
+            raise ValueError(f"A slab of {slab_size} units cannot hold an object of {self.size_classes[-1]}.")
+        self.large_strategy = large_strategy
+        # Size class index for every small size, so a request finds its class without searching.
+        self.class_of = [bisect.bisect_left(self.size_classes, size) for size in range(self.size_classes[-1] + 1)]
+        self.partial = [[] for _ in self.size_classes]
+        self.objects = {}  # Process ID -> (slab, slot, size), with no slab or slot for a large object
+        self.slabs = 0
+        self.slabs_created = 0
+        self.large_size = 0
+        self.live_size = 0  # Units the live objects asked for
+        self.requests = 0
+        self.failures = 0
+
+    def _new_slab(self, class_index):
+        size_class = self.size_classes[class_index]
+        slab_id = f"{SLAB_PREFIX}{self.slabs_created}"
+        start = self.memory.allocate(Process(slab_id, self.slab_size), FIRST)
+        if start is None:
+            return None
+        self.slabs_created += 1
+        self.slabs += 1
+        slab = Slab(slab_id, size_class, start, self.slab_size // size_class)
+        self._push_partial(class_index, slab)
+        return slab
+
+    def _push_partial(self, class_index, slab):
+        partial = self.partial[class_index]
+        slab.partial_index = len(partial)
+        partial.append(slab)
+
+    def _drop_partial(self, class_index, slab):
+        partial = self.partial[class_index]
+        last = partial.pop()
+        if last is not slab:
+            partial[slab.partial_index] = last
+            last.partial_index = slab.partial_index
+        slab.partial_index = None
+
+    def allocate(self, process: Process):
+        """Returns the object's address, or None if the memory has no room for it."""
+        if process.id in self.objects:
+            raise ValueError(f"Process '{process.id}' already has an object.")
+        if str(process.id).startswith(SLAB_PREFIX):
+            raise ValueError(f"Process ID '{process.id}' uses the '{SLAB_PREFIX}' prefix kept for slabs.")
+        if process.size <= 0:
+            raise ValueError(f"Process '{process.id}' needs a positive size, got {process.size}.")
+        self.requests += 1
+        if process.size > self.size_classes[-1]:
+            start = self.memory.allocate(process, self.large_strategy)
+            if start is None:
+                self.failures += 1
+                return None
+            self.objects[process.id] = (None, None, process.size)
+            self.large_size += process.size
+            self.live_size += process.size
+            return start
+
+        class_index = self.class_of[process.size]
+        partial = self.partial[class_index]
+        slab = partial[-1] if partial else self._new_slab(class_index)
+        if slab is None:
+            self.failures += 1
+            return None
+        slot = slab.free_slots.pop()
+        slab.in_use += 1
+        if not slab.free_slots:
+            self._drop_partial(class_index, slab)
+        self.objects[process.id] = (slab, slot, process.size)
+        self.live_size += process.size
+        return slab.start + slot * slab.size_class
+
+    def free(self, process_id: str):
+        if process_id not in self.objects:
+            raise KeyError(f"Process '{process_id}' has no object.")
+        slab, slot, size = self.objects.pop(process_id)
+        self.live_size -= size
+        if slab is None:
+            self.memory.free(process_id)
+            self.large_size -= size
+            return
+        class_index = self.class_of[slab.size_class]
+        if not slab.free_slots:
+            self._push_partial(class_index, slab)
+        slab.free_slots.append(slot)
+        slab.in_use -= 1
+        if not slab.in_use:
+            # Reclaim the empty slab.
+            self._drop_partial(class_index, slab)
+            self.memory.free(slab.id)
+            self.slabs -= 1
+
+    def held_size(self):
+        """Units taken from the memory: whole slabs plus large objects."""
+        return self.slabs * self.slab_size + self.large_size
+
+    def failure_rate(self):
+        return self.failures / self.requests if self.requests else 0.0
+
+
+def small_object_size(rng):
+    """Mostly a few common small sizes, some odd small sizes, and the occasional large object."""
+    draw = rng.random()
+    if draw < 0.8:
+        return rng.choice((16, 24, 32, 40, 64, 100, 128, 256))
+    if draw < 0.99:
+        return rng.randint(1, 512)
+    return rng.randint(513, 8192)
+
+
+def run(memory: DynamicMemory, allocate, free, stream) -> tuple[float, int, int]:
+    """Replays the stream with the given allocate and free.
+
+    Returns (seconds, peak units taken from memory, units the live objects
+    asked for at that peak). Departures of objects whose allocation failed
+    are skipped.
+    """
+    sizes = {}  # Process ID -> size asked for, for the live objects
+    requested = peak = peak_requested = 0
+    start = time.perf_counter()
+    for operation in stream:
+        if type(operation) is Process:
+            if allocate(operation) is not None:
+                sizes[operation.id] = operation.size
+                requested += operation.size
+                held = memory.total_size - memory.free_size
+                if held > peak:
+                    peak, peak_requested = held, requested
+        elif operation in sizes:
+            requested -= sizes.pop(operation)
+            free(operation)
+    return time.perf_counter() - start, peak, peak_requested
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the slab allocator with best and first fit on small objects.")
+    parser.add_argument("--memory", type=int, default=1 << 24, help="memory size in units")
+    parser.add_argument("--operations", type=int, default=500000)
+    parser.add_argument("--load", type=float, default=0.7, help="share of memory the live objects ask for on average")
+    parser.add_argument("--slab-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # small_object_size averages about 160 units.
+    stream = request_stream(args.operations, small_object_size, args.load * args.memory / 160, args.seed)
+
+    print("{:>10} {:>12} {:>14} {:>14} {:>10} {:>12}".format(
+        "Allocator", "Ops / s", "Failure Rate", "Peak Held", "Overhead", "Ext. Frag."))
+    for name in ("slab", BEST, FIRST):
+        memory = DynamicMemory(args.memory)
+        if name == "slab":
+            slabs = SlabAllocator(memory, args.slab_size)
+            elapsed, peak, peak_requested = run(memory, slabs.allocate, slabs.free, stream)
+            failure_rate = slabs.failure_rate()
+        else:
+            elapsed, peak, peak_requested = run(memory, lambda process: memory.allocate(process, name),
+                                                memory.free, stream)
+            failure_rate = memory.failure_rate()
+        # Units held at the peak beyond what the live objects asked for: size-class rounding and
+        # unused slab slots. Best and first fit give each object exactly its size, so theirs is 0
+        # and their waste shows as external fragmentation instead.
+        overhead = peak / peak_requested - 1 if peak_requested else 0.0
+        print("{:>10} {:>12,.0f} {:>14.2%} {:>14,} {:>10.1%} {:>12.1%}".format(
+            name, len(stream) / elapsed, failure_rate, peak, overhead, memory.external_fragmentation()))
+
+
+if __name__ == '__main__':
+    main()